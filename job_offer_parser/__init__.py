@@ -1,8 +1,22 @@
-from job_offer_parser.parsers.bulldogjob import BulldogJobParser  # noqa F401
-from job_offer_parser.parsers.inhire import InhireParser  # noqa F401
-from job_offer_parser.parsers.justjoinit import JustJoinITParser  # noqa F401
-from job_offer_parser.parsers.justjoinit_v2 import JustJoinITParserV2  # noqa F401
-from job_offer_parser.parsers.nofluffjobs import NoFluffJobsParser  # noqa F401
-from job_offer_parser.parsers.pracujpl import PracujPLParser  # noqa F401
-from job_offer_parser.parsers.solidjobs import SolidJobsParser  # noqa F401
-from job_offer_parser.parsers.theprotocol import TheProtocolParser  # noqa F401
+import importlib
+from typing import Any
+
+PARSER_CLASSES = {
+    "BulldogJobParser": "job_offer_parser.parsers.bulldogjob",
+    "InhireParser": "job_offer_parser.parsers.inhire",
+    "JustJoinITParser": "job_offer_parser.parsers.justjoinit",
+    "JustJoinITParserV2": "job_offer_parser.parsers.justjoinit_v2",
+    "NoFluffJobsParser": "job_offer_parser.parsers.nofluffjobs",
+    "PracujPLParser": "job_offer_parser.parsers.pracujpl",
+    "SolidJobsParser": "job_offer_parser.parsers.solidjobs",
+    "TheProtocolParser": "job_offer_parser.parsers.theprotocol",
+}
+__all__ = list(PARSER_CLASSES)
+
+
+def __getattr__(name: str) -> Any:
+    "Import parser classes on first access instead of with the package"
+    module = PARSER_CLASSES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module), name)
@@ -1,57 +1,267 @@
-import asyncio
+import argparse
+import contextlib
+import json
 import os
+import sys
+from dataclasses import asdict
+from typing import List, Tuple
 
-from job_offer_parser.cli import get_cli_arguments
+from job_offer_parser.archive import pack, save_raw_offer
+from job_offer_parser.cache import (
+    close_page_cache,
+    get_page_cache,
+    set_cache_enabled,
+)
+from job_offer_parser.cli import (
+    BATCH_COMMAND,
+    BENCH_COMMAND,
+    CRAWL_COMMAND,
+    EXPORT_COMMAND,
+    PACK_COMMAND,
+    SERVE_COMMAND,
+    get_cli_arguments,
+)
+from job_offer_parser.dedupe import (
+    close_dedupe_index,
+    find_duplicate,
+    set_dedupe_mode,
+    should_skip_duplicates,
+)
+from job_offer_parser.instrumentation import Profiler, print_profile, set_profiler
 from job_offer_parser.module_exceptions import AttributeNotFoundError, NoParserFound
-from job_offer_parser.settings import DEFAULT_RAW_OFFER_FILENAME, RAW_OFFERS_DIR
+from job_offer_parser.parser_stats import (
+    ParserStats,
+    get_parser_stats,
+    set_parser_stats,
+)
+from job_offer_parser.parsers.backends import set_backend
+from job_offer_parser.parsers.base_parser import Parser
+from job_offer_parser.parsers.document import Document
+from job_offer_parser.parsers.offer import JobOffer
+from job_offer_parser.settings import DEFAULT_RAW_OFFER_FILENAME
+from job_offer_parser.sources import (
+    STATUS_ERROR,
+    STATUS_NO_PARSER,
+    STATUS_PARSED,
+    SourceStatus,
+    read_sources,
+    save_page,
+)
 from job_offer_parser.utils import (
     ask_user_for_filename,
-    download_page,
+    extract_with_cache,
+    generate_fallback_filename,
     generate_filename,
     get_portal_from_url,
     get_portal_parsers,
     identify_portal,
     read_from_file,
-    save_to_file,
 )
 
 
 def main() -> None:
-    source = get_cli_arguments()
-    is_url = source.startswith("https:")
-    is_file = os.path.exists(source)
+    args = get_cli_arguments()
+    if args.backend:
+        set_backend(args.backend)
+    if args.stats_file:
+        set_parser_stats(ParserStats(args.stats_file))
+    if args.no_cache:
+        set_cache_enabled(False)
+    if args.profile:
+        set_profiler(Profiler())
+    if args.dedupe:
+        set_dedupe_mode(args.dedupe)
+    exit_code = run_command(args)
+    print_profile()
+    if exit_code:
+        sys.exit(exit_code)
+
+
+def run_command(args: argparse.Namespace) -> int:
+    "Run a command, importing only the modules it needs to keep startup fast"
+    if args.command == CRAWL_COMMAND:
+        import asyncio
+
+        from job_offer_parser.pipeline import crawl
+
+        return asyncio.run(
+            crawl(
+                read_sources(args.source),
+                concurrency=args.concurrency,
+                rate=args.rate,
+                retries=args.retries,
+                timeout=args.timeout,
+                workers=args.workers,
+            )
+        )
+    if args.command == SERVE_COMMAND:
+        import asyncio
+
+        from job_offer_parser.server import serve
+
+        with contextlib.suppress(KeyboardInterrupt):
+            asyncio.run(
+                serve(
+                    args.host,
+                    args.port,
+                    workers=args.workers,
+                    launch_browser=args.launch_browser,
+                    concurrency=args.concurrency,
+                )
+            )
+        return 0
+    if args.command == PACK_COMMAND:
+        return pack(args.action, args.archive, args.target)
+    if args.command == BATCH_COMMAND:
+        from job_offer_parser.batch import batch
+
+        batch(
+            args.source,
+            workers=args.workers,
+            ordered=args.ordered,
+            output_format=args.format,
+            incremental=args.incremental,
+        )
+        return 0
+    if args.command == EXPORT_COMMAND:
+        from job_offer_parser.export import export
+
+        export(
+            args.source,
+            output_dir=args.output,
+            output_format=args.format,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            restart=args.restart,
+            incremental=args.incremental,
+        )
+        return 0
+    if args.command == BENCH_COMMAND:
+        from job_offer_parser.bench import bench
 
-    if is_file:
-        page_content = read_from_file(source)
-        portal = identify_portal(page_content)
+        regressions = bench(
+            args.source,
+            output=args.output,
+            repeat=args.repeat,
+            baseline=args.baseline,
+            threshold=args.threshold,
+            import_budget=args.import_budget,
+        )
+        return 1 if regressions else 0
+    exit_code = run_sources(
+        read_sources(args.source), interactive=not args.non_interactive
+    )
+    get_parser_stats().save()
+    close_page_cache()
+    close_dedupe_index()
+    return exit_code
 
-    if is_url:
-        page_content = asyncio.run(download_page(source))
-        portal = get_portal_from_url(source)
 
+def download_source(url: str) -> Document:
+    import asyncio
+
+    from job_offer_parser.fetch import fetch_page
+
+    page_cache = get_page_cache()
+    page_content = page_cache.get_page(url) if page_cache else None
+    if page_content is not None:
+        print("Loaded from cache")
+        return Document(page_content)
+    fetch_result = asyncio.run(fetch_page(url))
+    print(f"Fetched with: {fetch_result.strategy} in {fetch_result.elapsed:.2f}s")
+    document = Document(fetch_result.page_content)
+    if page_cache:
+        page_cache.put_page(url, document.content_hash, document.text)
+    return document
+
+
+def run_sources(sources: List[str], interactive: bool = True) -> int:
+    exit_code = 0
+    for source in sources:
+        if interactive:
+            parse_source(source)
+            continue
+        with contextlib.redirect_stdout(sys.stderr):
+            try:
+                status = parse_source(source, interactive=False)
+            except Exception as e:
+                status = SourceStatus(source, STATUS_ERROR)
+                status.error = f"{e.__class__.__name__}: {e}"
+        print(json.dumps(asdict(status), ensure_ascii=False), flush=True)
+        if status.status != STATUS_PARSED:
+            exit_code = 1
+    return exit_code
+
+
+def load_source(source: str) -> Tuple[Document, str]:
+    if source.startswith("https:"):
+        return download_source(source), get_portal_from_url(source)
+    if os.path.exists(source):
+        document = Document(read_from_file(source))
+        return document, identify_portal(document)
+    raise FileNotFoundError(f"No such file or URL: {source}")
+
+
+def save_source(
+    document: Document, source: str, proposition: str, interactive: bool
+) -> str:
+    if not interactive:
+        return save_page(document, source, proposition)
+    filename = ask_user_for_filename(proposition)
+    return save_raw_offer(document.text, filename, source)
+
+
+def report_offer(status: SourceStatus, parser: Parser, offer: JobOffer) -> None:
+    parser_name = parser.__class__.__name__
+    print("\n\n".join(parser.render(offer)))
+    print(f"Parsed with {parser_name}")
+    get_parser_stats().record(status.portal, parser_name, success=True)
+    status.status, status.parser = STATUS_PARSED, parser_name
+    status.error = ""
+    status.offer = offer.to_dict()
+    status.duplicate_of = find_duplicate(status.source, offer)
+    if status.duplicate_of:
+        print(f"Duplicate of {status.duplicate_of}")
+
+
+def parse_source(source: str, interactive: bool = True) -> SourceStatus:
+    status = SourceStatus(source)
+    document, status.portal = load_source(source)
     try:
-        parsers = get_portal_parsers(portal)
+        parser_classes = get_portal_parsers(status.portal)
     except NoParserFound as e:
         print(e)
-        if is_url:
-            filename = ask_user_for_filename(DEFAULT_RAW_OFFER_FILENAME)
-            save_to_file(page_content, os.path.join(RAW_OFFERS_DIR, filename))
-        return
+        status.status, status.error = STATUS_NO_PARSER, str(e)
+        parser_classes = []
 
-    for parser_cls in parsers:
+    proposition = DEFAULT_RAW_OFFER_FILENAME
+    if not interactive:
+        proposition = generate_fallback_filename(source)
+    # Creating every candidate first lets the document build one tree for all
+    parsers = [parser_cls(document) for parser_cls in parser_classes]
+    for parser in parsers:
+        print(f"Parsing with: {parser.__class__.__name__}")
         try:
-            parser = parser_cls(page_content)
-            print(f"Parsing with: {parser.__class__.__name__}")
-            if is_url:
-                proposed_filename = generate_filename(parser)
-                filename = ask_user_for_filename(proposed_filename)
-                save_to_file(page_content, os.path.join(RAW_OFFERS_DIR, filename))
-            parsed_offer = parser.parse()
-            print("\n\n".join(parsed_offer))
-            print(f"Parsed with {parser.__class__.__name__}")
-            return
+            offer = extract_with_cache(parser)
+            filename = generate_filename(parser)
         except AttributeNotFoundError as e:
             print(e)
+            status.error = str(e)
+            get_parser_stats().record(
+                status.portal, parser.__class__.__name__, success=False
+            )
+            continue
+        proposition = filename
+        report_offer(status, parser, offer)
+        break
+
+    if not source.startswith("https:"):
+        return status
+    if status.duplicate_of and should_skip_duplicates():
+        print("Not saved: duplicate")
+        return status
+    status.saved_as = save_source(document, source, proposition, interactive)
+    return status
 
 
 if __name__ == "__main__":
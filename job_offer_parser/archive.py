@@ -0,0 +1,449 @@
+import glob
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import zlib
+from collections import Counter
+from dataclasses import asdict, dataclass
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple
+
+from job_offer_parser.module_exceptions import CorruptArchiveError
+from job_offer_parser.settings import (
+    ARCHIVE_DICT_SAMPLES,
+    ARCHIVE_DICT_SIZE,
+    RAW_ARCHIVE,
+    RAW_OFFERS_DIR,
+)
+from job_offer_parser.utils import read_from_file, save_to_file
+
+try:
+    import zstandard  # type: ignore
+except ImportError:
+    zstandard = None
+
+PACK_SUFFIX = ".pack"
+INDEX_SUFFIX = ".idx"
+PACK_MAGIC = b"JOBPACK1"
+ZSTD_CODEC = "zstd"
+ZLIB_CODEC = "zlib"
+ZSTD_LEVEL = 10
+ZLIB_LEVEL = 9
+ZLIB_DICT_SIZE = 32 * 1024
+ZLIB_DICT_MIN_SAMPLES = 2
+LENGTH = struct.Struct("<I")
+RECORD_HEADER = struct.Struct("<II")
+PACK_IMPORT = "import"
+PACK_EXPORT = "export"
+PACK_CAT = "cat"
+PACK_LIST = "ls"
+PACK_ACTIONS = (PACK_IMPORT, PACK_EXPORT, PACK_CAT, PACK_LIST)
+
+
+@dataclass
+class ArchiveEntry:
+    name: str
+    content_hash: str
+    offset: int
+    length: int
+    url: str = ""
+
+
+class Codec:
+    "Compression shared by every record of a pack, primed with a dictionary"
+
+    def __init__(self, name: str, dictionary: bytes = b"") -> None:
+        self.name = name
+        self.dictionary = dictionary
+        if name == ZSTD_CODEC:
+            zstd = _require_zstandard()
+            dict_data = zstd.ZstdCompressionDict(dictionary) if dictionary else None
+            self._compressor = zstd.ZstdCompressor(
+                level=ZSTD_LEVEL, dict_data=dict_data
+            )
+            self._decompressor = zstd.ZstdDecompressor(dict_data=dict_data)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.name == ZSTD_CODEC:
+            compressed: bytes = self._compressor.compress(data)
+            return compressed
+        compressor = zlib.compressobj(ZLIB_LEVEL, zdict=self.dictionary or None)
+        return compressor.compress(data) + compressor.flush()
+
+    def decompress(self, data: bytes) -> bytes:
+        if self.name == ZSTD_CODEC:
+            try:
+                decompressed: bytes = self._decompressor.decompress(data)
+            except zstandard.ZstdError as e:
+                raise CorruptArchiveError(f"Cannot decompress record: {e}")
+            return decompressed
+        decompressor = zlib.decompressobj(zdict=self.dictionary)
+        try:
+            decompressed = decompressor.decompress(data) + decompressor.flush()
+        except zlib.error as e:
+            raise CorruptArchiveError(f"Cannot decompress record: {e}")
+        if not decompressor.eof:
+            raise CorruptArchiveError("Compressed record is truncated")
+        return decompressed
+
+
+def _require_zstandard() -> Any:
+    if zstandard is None:
+        raise ImportError("zstandard is required for zstd packs: pip install zstandard")
+    return zstandard
+
+
+def train_zlib_dictionary(samples: List[bytes], size: int = ZLIB_DICT_SIZE) -> bytes:
+    "Markup fragments shared by most pages, the most common last as zlib prefers"
+    frequency = Counter(
+        fragment
+        for sample in samples
+        for fragment in set(sample.split(b">"))
+        if len(fragment) > 3
+    )
+    min_samples = min(ZLIB_DICT_MIN_SAMPLES, len(samples))
+    fragments = sorted(
+        (fragment for fragment, count in frequency.items() if count >= min_samples),
+        key=lambda fragment: (frequency[fragment], len(fragment)),
+        reverse=True,
+    )
+    dictionary: List[bytes] = []
+    length = 0
+    for fragment in fragments:
+        if length + len(fragment) + 1 > size:
+            continue
+        dictionary.append(fragment + b">")
+        length += len(fragment) + 1
+    return b"".join(reversed(dictionary))
+
+
+def train_codec(samples: List[bytes]) -> Codec:
+    if zstandard is None:
+        return Codec(ZLIB_CODEC, train_zlib_dictionary(samples))
+    try:
+        dictionary = zstandard.train_dictionary(ARCHIVE_DICT_SIZE, samples)
+    except zstandard.ZstdError:
+        return Codec(ZSTD_CODEC)
+    return Codec(ZSTD_CODEC, dictionary.as_bytes())
+
+
+class RawArchive:
+    "Append-only pack of compressed raw offers with an offset index"
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.index_path = f"{path}{INDEX_SUFFIX}"
+        self._map: Optional[mmap.mmap] = None
+        self._pack_file: Optional[IO[bytes]] = None
+        self._index_file: Optional[IO[str]] = None
+        self._entries: Dict[str, ArchiveEntry] = {}
+        self._keys: Dict[str, ArchiveEntry] = {}
+        self._end = 0
+        with open(path, "rb") as file:
+            self.codec, self._data_start = self._read_header(file.read)
+        if os.path.exists(self.index_path):
+            self._load_index()
+        else:
+            self._rebuild_index()
+
+    @classmethod
+    def create(cls, path: str, samples: List[bytes]) -> "RawArchive":
+        codec = train_codec(samples)
+        header = json.dumps({"codec": codec.name}).encode()
+        with open(path, "xb") as file:
+            file.write(PACK_MAGIC)
+            file.write(LENGTH.pack(len(header)) + header)
+            file.write(LENGTH.pack(len(codec.dictionary)) + codec.dictionary)
+        return cls(path)
+
+    def __enter__(self) -> "RawArchive":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._unmap()
+        if self._pack_file is not None and self._index_file is not None:
+            self._pack_file.close()
+            self._index_file.close()
+            self._pack_file = self._index_file = None
+
+    def _unmap(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    @staticmethod
+    def _read_header(read: Any) -> Tuple[Codec, int]:
+        if read(len(PACK_MAGIC)) != PACK_MAGIC:
+            raise ValueError("Not a raw offers pack")
+        (header_length,) = LENGTH.unpack(read(LENGTH.size))
+        header = json.loads(read(header_length))
+        (dictionary_length,) = LENGTH.unpack(read(LENGTH.size))
+        dictionary = read(dictionary_length)
+        data_start = len(PACK_MAGIC) + 2 * LENGTH.size
+        data_start += header_length + dictionary_length
+        return Codec(header["codec"], dictionary), data_start
+
+    def _add_entry(self, entry: ArchiveEntry) -> None:
+        self._entries[entry.name] = entry
+        self._keys[entry.name] = entry
+        self._keys[entry.content_hash] = entry
+        if entry.url:
+            self._keys[entry.url] = entry
+
+    def _load_index(self) -> None:
+        "Load the index, dropping entries past the end of the pack"
+        size = os.path.getsize(self.path)
+        self._end, damaged = self._data_start, False
+        with open(self.index_path, "r") as file:
+            for line in file:
+                try:
+                    entry = ArchiveEntry(**json.loads(line))
+                except (TypeError, ValueError):
+                    damaged = True
+                    continue
+                if entry.offset + entry.length > size:
+                    damaged = True
+                    continue
+                self._add_entry(entry)
+                self._end = max(self._end, entry.offset + entry.length)
+        if damaged:
+            with open(self.index_path, "w") as file:
+                file.writelines(
+                    json.dumps(asdict(entry)) + "\n" for entry in self.entries
+                )
+        self._index_records()
+
+    def _rebuild_index(self) -> None:
+        self._end = self._data_start
+        open(self.index_path, "w").close()
+        self._index_records()
+
+    @staticmethod
+    def _read_record_entry(
+        file: IO[bytes], offset: int, size: int
+    ) -> Optional[ArchiveEntry]:
+        "Entry of the record at offset, or None if the record is incomplete"
+        if offset + RECORD_HEADER.size > size:
+            return None
+        file.seek(offset)
+        meta_length, payload_length = RECORD_HEADER.unpack(
+            file.read(RECORD_HEADER.size)
+        )
+        length = RECORD_HEADER.size + meta_length + payload_length
+        if offset + length > size:
+            return None
+        try:
+            return ArchiveEntry(
+                offset=offset, length=length, **json.loads(file.read(meta_length))
+            )
+        except (TypeError, ValueError):
+            return None
+
+    def _index_records(self) -> None:
+        "Index records appended after the last indexed one, up to a truncated tail"
+        size = os.path.getsize(self.path)
+        with open(self.path, "rb") as file, open(self.index_path, "a") as index:
+            while self._end < size:
+                entry = self._read_record_entry(file, self._end, size)
+                if entry is None:
+                    break
+                index.write(json.dumps(asdict(entry)) + "\n")
+                self._add_entry(entry)
+                self._end += entry.length
+
+    @property
+    def entries(self) -> List[ArchiveEntry]:
+        return sorted(self._entries.values(), key=lambda entry: entry.offset)
+
+    def names(self) -> List[str]:
+        return sorted(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._keys
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, text: str, name: str, url: str = "") -> ArchiveEntry:
+        data = text.encode()
+        content_hash = hashlib.sha256(data).hexdigest()
+        existing = self._entries.get(name)
+        if existing is not None and existing.content_hash == content_hash:
+            return existing
+        meta = json.dumps({"name": name, "content_hash": content_hash, "url": url})
+        payload = self.codec.compress(data)
+        record = RECORD_HEADER.pack(len(meta.encode()), len(payload))
+        record += meta.encode() + payload
+        if self._pack_file is None or self._index_file is None:
+            self._pack_file = open(self.path, "r+b")
+            self._pack_file.truncate(self._end)
+            self._pack_file.seek(self._end)
+            self._index_file = open(self.index_path, "a")
+        entry = ArchiveEntry(name, content_hash, self._end, len(record), url)
+        self._pack_file.write(record)
+        self._pack_file.flush()
+        self._index_file.write(json.dumps(asdict(entry)) + "\n")
+        self._index_file.flush()
+        self._add_entry(entry)
+        self._end += entry.length
+        self._unmap()
+        return entry
+
+    def _get_map(self) -> mmap.mmap:
+        if self._map is None:
+            with open(self.path, "rb") as file:
+                self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map
+
+    def read(self, entry: ArchiveEntry) -> str:
+        data = self._get_map()
+        if entry.offset + entry.length > len(data):
+            raise CorruptArchiveError(f"{entry.name} runs past the end of {self.path}")
+        meta_length, payload_length = RECORD_HEADER.unpack_from(data, entry.offset)
+        start = entry.offset + RECORD_HEADER.size + meta_length
+        end = start + payload_length
+        content = self.codec.decompress(data[start:end])
+        if hashlib.sha256(content).hexdigest() != entry.content_hash:
+            raise CorruptArchiveError(f"{entry.name} in {self.path} is damaged")
+        return content.decode()
+
+    def entry(self, key: str) -> ArchiveEntry:
+        "Find an offer by its name, content hash or URL"
+        return self._keys[key]
+
+    def get(self, key: str) -> str:
+        return self.read(self.entry(key))
+
+    def __iter__(self) -> Iterator[Tuple[ArchiveEntry, str]]:
+        for entry in self.entries:
+            yield entry, self.read(entry)
+
+
+def is_pack(path: str) -> bool:
+    return path.endswith(PACK_SUFFIX) and os.path.isfile(path)
+
+
+def split_member(path: str) -> Optional[Tuple[str, str]]:
+    "Split 'archive.pack/name.html' into the pack path and the member name"
+    pack_path, separator, name = path.partition(f"{PACK_SUFFIX}{os.sep}")
+    if not separator or not name:
+        return None
+    return f"{pack_path}{PACK_SUFFIX}", name
+
+
+_archives: Dict[str, RawArchive] = {}
+
+
+def open_archive(path: str) -> RawArchive:
+    archive = _archives.get(path)
+    if archive is None:
+        archive = _archives[path] = RawArchive(path)
+    return archive
+
+
+def list_members(path: str) -> List[str]:
+    return [os.path.join(path, name) for name in open_archive(path).names()]
+
+
+def read_raw_offer(path: str) -> str:
+    member = split_member(path)
+    if member is None:
+        return read_from_file(path)
+    pack_path, name = member
+    return open_archive(pack_path).get(name)
+
+
+def get_source_signature(path: str) -> Tuple[int, int]:
+    "Size and version of a raw offer, used to detect changed sources"
+    member = split_member(path)
+    if member is None:
+        stat = os.stat(path)
+        return stat.st_size, stat.st_mtime_ns
+    pack_path, name = member
+    entry = open_archive(pack_path).entry(name)
+    return entry.length, entry.offset
+
+
+def import_directory(
+    filenames: List[str], path: str, samples: int = ARCHIVE_DICT_SAMPLES
+) -> int:
+    if not os.path.exists(path):
+        sample_data = [read_from_file(name).encode() for name in filenames[:samples]]
+        RawArchive.create(path, sample_data).close()
+    archive = open_archive(path)
+    count = len(archive)
+    for filename in filenames:
+        archive.add(read_from_file(filename), os.path.basename(filename))
+    return len(archive) - count
+
+
+def export_directory(path: str, output_dir: str) -> int:
+    os.makedirs(output_dir, exist_ok=True)
+    archive = open_archive(path)
+    for entry, text in archive:
+        save_to_file(text, os.path.join(output_dir, entry.name))
+    return len(archive)
+
+
+def get_saved_hash(filename: str) -> Optional[str]:
+    if RAW_ARCHIVE:
+        if not os.path.exists(RAW_ARCHIVE):
+            return None
+        archive = open_archive(RAW_ARCHIVE)
+        return archive.entry(filename).content_hash if filename in archive else None
+    path = os.path.join(RAW_OFFERS_DIR, filename)
+    if not os.path.exists(path):
+        return None
+    return hashlib.sha256(read_from_file(path).encode()).hexdigest()
+
+
+def get_unique_filename(filename: str, text: str) -> str:
+    "Return filename, or a numbered variant if another offer is saved under it"
+    content_hash = hashlib.sha256(text.encode()).hexdigest()
+    stem, extension = os.path.splitext(filename)
+    candidate, number = filename, 1
+    while True:
+        saved_hash = get_saved_hash(candidate)
+        if saved_hash is None or saved_hash == content_hash:
+            return candidate
+        number += 1
+        candidate = f"{stem} ({number}){extension}"
+
+
+def save_raw_offer(text: str, filename: str, url: str = "") -> str:
+    if not RAW_ARCHIVE:
+        path = os.path.join(RAW_OFFERS_DIR, filename)
+        save_to_file(text, path)
+        return path
+    if not os.path.exists(RAW_ARCHIVE):
+        RawArchive.create(RAW_ARCHIVE, [text.encode()]).close()
+    open_archive(RAW_ARCHIVE).add(text, filename, url)
+    return os.path.join(RAW_ARCHIVE, filename)
+
+
+def pack(action: str, path: str, target: Optional[str] = None) -> int:
+    if action == PACK_IMPORT:
+        filenames = sorted(glob.glob(os.path.join(target or RAW_OFFERS_DIR, "*.html")))
+        added = import_directory(filenames, path)
+        print(f"Added {added} of {len(filenames)} files to {path}", file=sys.stderr)
+    elif action == PACK_EXPORT:
+        count = export_directory(path, target or RAW_OFFERS_DIR)
+        print(f"Exported {count} files from {path}", file=sys.stderr)
+    elif action == PACK_CAT:
+        try:
+            page = open_archive(path).get(target or "")
+        except KeyError:
+            print(f"No record named {target!r} in {path}", file=sys.stderr)
+            return 1
+        sys.stdout.write(page)
+    else:
+        for entry in open_archive(path).entries:
+            print(
+                f"{entry.content_hash[:12]} {entry.length:>9} {entry.name} {entry.url}"
+            )
+    return 0
@@ -0,0 +1,248 @@
+import glob
+import os
+import sys
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    as_completed,
+    wait,
+)
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, List, Optional, Set
+
+from job_offer_parser.archive import is_pack, list_members, read_raw_offer
+from job_offer_parser.cache import is_cache_enabled, set_cache_enabled
+from job_offer_parser.dedupe import (
+    close_dedupe_index,
+    find_duplicate,
+    should_skip_duplicates,
+)
+from job_offer_parser.instrumentation import (
+    Profile,
+    Profiler,
+    get_profiler,
+    set_profiler,
+)
+from job_offer_parser.manifest import Manifest
+from job_offer_parser.parser_stats import (
+    ParserStats,
+    get_parser_stats,
+    set_parser_stats,
+)
+from job_offer_parser.parsers.backends import get_backend, set_backend
+from job_offer_parser.parsers.document import Document
+from job_offer_parser.parsers.offer import JobOffer
+from job_offer_parser.serializers import JSONL_FORMAT, TEXT_FORMAT, to_json_line
+from job_offer_parser.utils import identify_portal, parse_page
+
+RAW_OFFER_PATTERN = "*.html"
+# Files submitted ahead per worker, so results stream without queueing the archive
+FUTURES_PER_WORKER = 2
+WARM_UP_PAGE = '<html><body><div class="offer">Warm up</div></body></html>'
+
+
+@dataclass
+class BatchResult:
+    filename: str
+    portal: str = ""
+    parser_name: str = ""
+    parser_version: int = 0
+    content_hash: str = ""
+    offer: Optional[JobOffer] = None
+    parsed_offer: List[str] = field(default_factory=list)
+    failed_parsers: List[str] = field(default_factory=list)
+    error: str = ""
+    duplicate_of: str = ""
+    elapsed: float = 0.0
+    profile: Optional[Profile] = None
+
+    @property
+    def ok(self) -> bool:
+        return not self.error
+
+
+@dataclass
+class BatchSummary:
+    parsed: int = 0
+    failed: int = 0
+    duplicates: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def total(self) -> int:
+        return self.parsed + self.failed
+
+    @property
+    def throughput(self) -> float:
+        return self.total / self.elapsed if self.elapsed else 0.0
+
+
+def collect_sources(source: str) -> List[str]:
+    if is_pack(source):
+        return list_members(source)
+    if os.path.isdir(source):
+        source = os.path.join(source, "**", RAW_OFFER_PATTERN)
+    filenames = glob.glob(source, recursive=True)
+    return sorted(filename for filename in filenames if os.path.isfile(filename))
+
+
+def warm_up_worker() -> None:
+    "Import every parser and the tree builder, so the first file is not parsed cold"
+    from job_offer_parser.parsers.registry import REGISTRY
+
+    REGISTRY.load_entry_points()
+    REGISTRY.load_modules()
+    Document(WARM_UP_PAGE).soup
+
+
+def init_worker(
+    backend: str,
+    parser_stats_filename: Optional[str],
+    cache_enabled: bool,
+    profile: bool = False,
+    warm_up: bool = False,
+) -> None:
+    set_backend(backend)
+    set_parser_stats(ParserStats(parser_stats_filename))
+    set_cache_enabled(cache_enabled)
+    set_profiler(Profiler() if profile else None)
+    if warm_up:
+        warm_up_worker()
+
+
+def parse_file(filename: str) -> BatchResult:
+    result = BatchResult(filename)
+    start = time.perf_counter()
+    try:
+        document = Document(read_raw_offer(filename))
+        result.content_hash = document.content_hash
+        result.portal = identify_portal(document)
+        parser, result.offer = parse_page(
+            document, result.portal, result.failed_parsers
+        )
+        result.parsed_offer = parser.render(result.offer)
+        result.parser_name = parser.__class__.__name__
+        result.parser_version = parser.parser_version
+    except Exception as e:
+        result.error = f"{e.__class__.__name__}: {e}"
+    result.elapsed = time.perf_counter() - start
+    profiler = get_profiler()
+    if profiler is not None:
+        result.profile = profiler.pop_stages()
+    return result
+
+
+def record_result(parser_stats: ParserStats, result: BatchResult) -> None:
+    profiler = get_profiler()
+    if profiler is not None and result.profile:
+        profiler.merge(result.profile)
+    for parser_name in result.failed_parsers:
+        parser_stats.record(result.portal, parser_name, success=False)
+    if result.parser_name:
+        parser_stats.record(result.portal, result.parser_name, success=True)
+
+
+def create_executor(
+    workers: Optional[int] = None, warm_up: bool = False
+) -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=init_worker,
+        initargs=(
+            get_backend(),
+            get_parser_stats().filename,
+            is_cache_enabled(),
+            get_profiler() is not None,
+            warm_up,
+        ),
+    )
+
+
+def run_batch(
+    filenames: Iterable[str], workers: Optional[int] = None, ordered: bool = False
+) -> Iterator[BatchResult]:
+    with create_executor(workers) as executor:
+        if ordered:
+            yield from executor.map(parse_file, filenames, chunksize=8)
+            return
+        window = FUTURES_PER_WORKER * (workers or os.cpu_count() or 1)
+        pending: Set[Future] = set()
+        for filename in filenames:
+            if len(pending) >= window:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                yield from (future.result() for future in done)
+            pending.add(executor.submit(parse_file, filename))
+        for future in as_completed(pending):
+            yield future.result()
+
+
+def print_result(result: BatchResult, output_format: str = TEXT_FORMAT) -> None:
+    if not result.ok:
+        print(f"Failed {result.filename}: {result.error}", file=sys.stderr)
+        return
+    if output_format == JSONL_FORMAT and result.offer is not None:
+        print(to_json_line(result.offer))
+        return
+    print("\n\n".join(result.parsed_offer))
+    print(f"Parsed {result.filename} with {result.parser_name}")
+    if result.duplicate_of:
+        print(f"Duplicate of {result.duplicate_of}")
+    print()
+
+
+def handle_result(
+    result: BatchResult,
+    summary: BatchSummary,
+    output_format: str,
+    manifest: Optional[Manifest],
+) -> None:
+    if result.offer is not None:
+        result.duplicate_of = find_duplicate(result.filename, result.offer)
+        summary.duplicates += bool(result.duplicate_of)
+    if not (result.duplicate_of and should_skip_duplicates()):
+        print_result(result, output_format)
+    record_result(get_parser_stats(), result)
+    if manifest:
+        manifest.record(result)
+    if result.ok:
+        summary.parsed += 1
+    else:
+        summary.failed += 1
+
+
+def batch(
+    source: str,
+    workers: Optional[int] = None,
+    ordered: bool = False,
+    output_format: str = TEXT_FORMAT,
+    incremental: bool = False,
+) -> None:
+    filenames = collect_sources(source)
+    manifest = Manifest() if incremental else None
+    if manifest:
+        changed = manifest.select_changed(filenames)
+        print(
+            f"Skipping {len(filenames) - len(changed)} unchanged files", file=sys.stderr
+        )
+        filenames = changed
+    summary = BatchSummary()
+    start = time.perf_counter()
+    try:
+        for result in run_batch(filenames, workers=workers, ordered=ordered):
+            handle_result(result, summary, output_format, manifest)
+    finally:
+        # Keep the progress of an interrupted run
+        get_parser_stats().save()
+        close_dedupe_index()
+        if manifest:
+            manifest.close()
+    summary.elapsed = time.perf_counter() - start
+    print(
+        f"Parsed {summary.parsed}/{summary.total} files, {summary.failed} failed "
+        f"in {summary.elapsed:.2f}s ({summary.throughput:.1f} files/s)",
+        file=sys.stderr,
+    )
+    if summary.duplicates:
+        print(f"Found {summary.duplicates} near-duplicate offers", file=sys.stderr)
@@ -0,0 +1,248 @@
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Type
+
+from job_offer_parser.archive import read_raw_offer
+from job_offer_parser.batch import collect_sources
+from job_offer_parser.module_exceptions import AttributeNotFoundError
+from job_offer_parser.parsers.backends import get_backend
+from job_offer_parser.parsers.base_parser import BaseParser, Parser
+from job_offer_parser.parsers.document import Document
+from job_offer_parser.parsers.registry import REGISTRY
+from job_offer_parser.parsers.selector_index import SelectorIndex
+from job_offer_parser.settings import BENCH_REPEAT, BENCH_THRESHOLD, IMPORT_TIME_BUDGET
+from job_offer_parser.utils import identify_portal
+
+BENCH_METRICS = ("soup_build", "index_build", "parse")
+STARTUP_MODULE = "job_offer_parser.__main__"
+LAZY_MODULES = ("bs4", "lxml", "pyppeteer", "urllib3", "websockets")
+# Saved offers are single-page-app pages of a few hundred kilobytes
+REPRESENTATIVE_PAGE_SIZE = 100 * 1024
+
+
+@dataclass
+class BenchResult:
+    filename: str
+    portal: str
+    parser_name: str
+    ok: bool = False
+    soup_build: float = 0.0
+    index_build: float = 0.0
+    parse: float = 0.0
+    attributes: Dict[str, float] = field(default_factory=dict)
+    alloc_peak: int = 0
+    page_size: int = 0
+
+    @property
+    def key(self) -> str:
+        return f"{os.path.basename(self.filename)}:{self.parser_name}"
+
+
+def best_time(function: Callable[[], Any], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def try_parse(parser_cls: Type[Parser], text: str) -> bool:
+    try:
+        parser_cls(Document(text)).parse()
+    except AttributeNotFoundError:
+        return False
+    return True
+
+
+def measure_alloc_peak(parser_cls: Type[Parser], text: str) -> int:
+    tracemalloc.start()
+    try:
+        try_parse(parser_cls, text)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def measure_selectors(
+    result: BenchResult, parser_cls: Type[Parser], document: Document, repeat: int
+) -> None:
+    selectors = parser_cls.default_selectors
+    if selectors is None or not issubclass(parser_cls, BaseParser):
+        return
+    # The parser narrows the document to its containers, as during a parse
+    parser_cls(document, selectors)
+    keys = frozenset(selector.key for selector in selectors)
+    result.index_build = best_time(partial(SelectorIndex, document.soup, keys), repeat)
+    # A fresh index, not the parser's, built outside the timed lookups
+    index = SelectorIndex(document.soup, keys)
+    result.attributes = {
+        attribute: best_time(partial(index.find_all, selector.key), repeat)
+        for attribute, selector in selectors.items()
+    }
+
+
+def bench_parser(
+    filename: str, text: str, portal: str, parser_cls: Type[Parser], repeat: int
+) -> BenchResult:
+    result = BenchResult(filename, portal, parser_cls.__name__, page_size=len(text))
+    document = Document(text)
+    result.soup_build = best_time(
+        lambda: parser_cls(Document(text)).document.soup, repeat
+    )
+    result.ok = try_parse(parser_cls, text)
+    result.parse = best_time(partial(try_parse, parser_cls, text), repeat)
+    measure_selectors(result, parser_cls, document, repeat)
+    result.alloc_peak = measure_alloc_peak(parser_cls, text)
+    return result
+
+
+def bench_file(filename: str, repeat: int) -> List[BenchResult]:
+    text = read_raw_offer(filename)
+    portal = identify_portal(text)
+    parsers = REGISTRY.get_parsers(portal)
+    if not parsers:
+        print(f"Skipping {filename}: no parser for {portal!r}", file=sys.stderr)
+    return [
+        bench_parser(filename, text, portal, parser_cls, repeat)
+        for parser_cls in parsers
+    ]
+
+
+def get_peak_rss() -> int:
+    "Peak resident set size of the process in kilobytes"
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak_rss // 1024 if sys.platform == "darwin" else peak_rss
+
+
+def measure_import_time(module: str = STARTUP_MODULE) -> Tuple[float, Set[str]]:
+    "Cumulative import time of a module in a fresh interpreter and what it loaded"
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    imported: Dict[str, float] = {}
+    for line in completed.stderr.splitlines():
+        fields = line.split("|")
+        if len(fields) == 3 and fields[1].strip().isdigit():
+            imported[fields[2].strip()] = int(fields[1]) / 1_000_000
+    return imported.get(module, 0.0), set(imported)
+
+
+def check_startup(import_time: float, imported: Set[str], budget: float) -> List[str]:
+    problems = [
+        f"{STARTUP_MODULE} imports {module} eagerly"
+        for module in LAZY_MODULES
+        if module in imported
+    ]
+    if import_time > budget:
+        problems.append(
+            f"{STARTUP_MODULE} import time: {import_time * 1000:.2f}ms, "
+            f"budget {budget * 1000:.2f}ms"
+        )
+    return problems
+
+
+def compare(
+    results: List[BenchResult], baseline: Dict[str, Any], threshold: float
+) -> List[str]:
+    baseline_results = {
+        f"{os.path.basename(item['filename'])}:{item['parser_name']}": item
+        for item in baseline["results"]
+    }
+    regressions = []
+    for result in results:
+        previous = baseline_results.get(result.key)
+        if previous is None:
+            continue
+        for metric in BENCH_METRICS:
+            before, after = previous[metric], getattr(result, metric)
+            if before and after > before * (1 + threshold):
+                regressions.append(
+                    f"{result.key} {metric}: {before * 1000:.2f}ms -> "
+                    f"{after * 1000:.2f}ms (+{(after / before - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def print_summary(results: List[BenchResult]) -> None:
+    groups: Dict[str, List[BenchResult]] = {}
+    for result in results:
+        groups.setdefault(f"{result.portal} {result.parser_name}", []).append(result)
+    for name, group in sorted(groups.items()):
+        parsed = sum(result.ok for result in group)
+        soup_build = statistics.median(result.soup_build for result in group)
+        parse = statistics.median(result.parse for result in group)
+        print(
+            f"{name}: {parsed}/{len(group)} parsed, median soup build "
+            f"{soup_build * 1000:.2f}ms, median parse {parse * 1000:.2f}ms",
+            file=sys.stderr,
+        )
+
+
+def warn_small_corpus(results: List[BenchResult]) -> None:
+    if not results:
+        return
+    page_size = statistics.median(result.page_size for result in results)
+    if page_size < REPRESENTATIVE_PAGE_SIZE:
+        print(
+            f"Corpus pages are {page_size / 1024:.1f} kB (median), much smaller than "
+            "saved offers: soup, index and lookup timings will not show DOM-size costs",
+            file=sys.stderr,
+        )
+
+
+def bench(
+    source: str,
+    output: str,
+    repeat: int = BENCH_REPEAT,
+    baseline: Optional[str] = None,
+    threshold: float = BENCH_THRESHOLD,
+    import_budget: float = IMPORT_TIME_BUDGET,
+) -> List[str]:
+    import_time, imported = min(
+        (measure_import_time() for _ in range(repeat)), key=lambda item: item[0]
+    )
+    results = [
+        result
+        for filename in collect_sources(source)
+        for result in bench_file(filename, repeat)
+    ]
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "backend": get_backend(),
+        "repeat": repeat,
+        "peak_rss_kb": get_peak_rss(),
+        "import_time": import_time,
+        "results": [asdict(result) for result in results],
+    }
+    with open(output, "w") as file:
+        json.dump(report, file, indent=2)
+    print_summary(results)
+    warn_small_corpus(results)
+    print(
+        f"Startup import {import_time * 1000:.2f}ms, peak RSS "
+        f"{report['peak_rss_kb']} kB, results in {output}",
+        file=sys.stderr,
+    )
+    regressions = check_startup(import_time, imported, import_budget)
+    if baseline:
+        with open(baseline, "r") as file:
+            regressions.extend(compare(results, json.load(file), threshold))
+    for regression in regressions:
+        print(f"Regression {regression}", file=sys.stderr)
+    return regressions
@@ -0,0 +1,127 @@
+import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from types import TracebackType
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Type,
+    Union,
+)
+
+from job_offer_parser.instrumentation import span
+from job_offer_parser.settings import BROWSER_TIMEOUT
+
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "stylesheet", "media"})
+DEFAULT_CONCURRENCY = 4
+
+
+@dataclass
+class PageDownload:
+    url: str
+    page_content: Optional[str] = None
+    error: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return self.page_content is not None
+
+
+def to_page_download(url: str, page: Union[str, BaseException]) -> PageDownload:
+    if isinstance(page, str):
+        return PageDownload(url, page)
+    if not isinstance(page, Exception):
+        raise page
+    return PageDownload(url, error=f"{page.__class__.__name__}: {page}")
+
+
+class BrowserPool:
+    def __init__(
+        self,
+        size: int = DEFAULT_CONCURRENCY,
+        blocked_resource_types: Optional[Iterable[str]] = BLOCKED_RESOURCE_TYPES,
+        launch_options: Optional[Dict[str, Any]] = None,
+        timeout: float = BROWSER_TIMEOUT,
+    ) -> None:
+        self._size = size
+        self._timeout = timeout
+        self._blocked_resource_types: FrozenSet[str] = frozenset(
+            blocked_resource_types or ()
+        )
+        self._launch_options = launch_options or {}
+        self._browser: Any = None
+        self._pages: "asyncio.Queue[Any]" = asyncio.Queue()
+
+    async def __aenter__(self) -> "BrowserPool":
+        from pyppeteer import launch  # type: ignore
+
+        self._browser = await launch(**self._launch_options)
+        try:
+            for _ in range(self._size):
+                self._pages.put_nowait(await self._new_page())
+        except BaseException:
+            await self._close()
+            raise
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        await self._close()
+
+    async def _close(self) -> None:
+        browser, self._browser = self._browser, None
+        self._pages = asyncio.Queue()
+        await browser.close()
+
+    async def _new_page(self) -> Any:
+        page = await self._browser.newPage()
+        if self._blocked_resource_types:
+            await page.setRequestInterception(True)
+            page.on("request", self._intercept)
+        return page
+
+    def _intercept(self, request: Any) -> None:
+        if request.resourceType in self._blocked_resource_types:
+            asyncio.ensure_future(request.abort())
+        else:
+            asyncio.ensure_future(request.continue_())
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[Any]:
+        page = await self._pages.get()
+        try:
+            yield page
+        finally:
+            self._pages.put_nowait(page)
+
+    async def download(self, url: str) -> str:
+        async with self.page() as page:
+            with span("browser", "goto"):
+                await page.goto(url, timeout=self._timeout * 1000)
+            with span("browser", "content"):
+                page_content: str = await page.content()
+        return page_content
+
+    async def download_many(self, urls: Iterable[str]) -> List[PageDownload]:
+        "Download every URL; a failed page is reported without losing the others"
+        urls = list(urls)
+        pages = await asyncio.gather(
+            *(self.download(url) for url in urls), return_exceptions=True
+        )
+        return [to_page_download(url, page) for url, page in zip(urls, pages)]
+
+
+async def download_pages(
+    urls: Iterable[str], concurrency: int = DEFAULT_CONCURRENCY
+) -> List[PageDownload]:
+    async with BrowserPool(size=concurrency) as pool:
+        return await pool.download_many(urls)
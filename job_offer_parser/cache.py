@@ -0,0 +1,227 @@
+import json
+import os
+import sqlite3
+import time
+import urllib.parse
+import zlib
+from typing import Any, Optional, Tuple, Type
+
+from job_offer_parser.module_exceptions import AttributeNotFoundError
+from job_offer_parser.parsers.base_parser import Parser
+from job_offer_parser.parsers.offer import JobOffer
+from job_offer_parser.settings import (
+    CACHE_ENABLED,
+    CACHE_FILE,
+    CACHE_MAX_SIZE,
+    CACHE_TTL,
+)
+
+TRACKING_QUERY_PREFIXES = ("utm_", "fbclid", "gclid")
+EVICT_EVERY_WRITES = 100
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    content_hash TEXT PRIMARY KEY,
+    html BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS urls (
+    url TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    content_hash TEXT NOT NULL,
+    parser_name TEXT NOT NULL,
+    parser_fingerprint TEXT NOT NULL,
+    offer TEXT,
+    error TEXT,
+    size INTEGER NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (content_hash, parser_name, parser_fingerprint)
+);
+"""
+
+
+def normalize_url(url: str) -> str:
+    parsed_url = urllib.parse.urlsplit(url.strip())
+    query = sorted(
+        (key, value)
+        for key, value in urllib.parse.parse_qsl(parsed_url.query)
+        if not key.lower().startswith(TRACKING_QUERY_PREFIXES)
+    )
+    return urllib.parse.urlunsplit(
+        (
+            parsed_url.scheme.lower(),
+            parsed_url.netloc.lower(),
+            parsed_url.path.rstrip("/") or "/",
+            urllib.parse.urlencode(query),
+            "",
+        )
+    )
+
+
+class PageCache:
+    "Compressed raw pages by URL and content hash, plus parse results per parser"
+
+    def __init__(
+        self,
+        filename: str = CACHE_FILE,
+        ttl: float = CACHE_TTL,
+        max_size: int = CACHE_MAX_SIZE,
+    ) -> None:
+        self._ttl = ttl
+        self._max_size = max_size
+        self._writes = 0
+        os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+        self._connection = sqlite3.connect(filename, timeout=30, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.evict()
+        self._connection.close()
+
+    def _written(self) -> None:
+        self._writes += 1
+        if self._writes % EVICT_EVERY_WRITES == 0:
+            self.evict()
+
+    def has_page(self, url: str) -> bool:
+        row = self._connection.execute(
+            "SELECT 1 FROM urls WHERE url = ? AND fetched_at >= ?",
+            (normalize_url(url), time.time() - self._ttl),
+        ).fetchone()
+        return row is not None
+
+    def get_page(self, url: str) -> Optional[str]:
+        row = self._connection.execute(
+            "SELECT pages.content_hash, pages.html FROM urls "
+            "JOIN pages ON pages.content_hash = urls.content_hash "
+            "WHERE urls.url = ? AND urls.fetched_at >= ?",
+            (normalize_url(url), time.time() - self._ttl),
+        ).fetchone()
+        if row is None:
+            return None
+        content_hash, html = row
+        self._touch("pages", "content_hash = ?", (content_hash,))
+        return zlib.decompress(html).decode()
+
+    def put_page(self, url: str, content_hash: str, page_content: str) -> None:
+        html = zlib.compress(page_content.encode())
+        now = time.time()
+        self._connection.execute(
+            "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?)",
+            (content_hash, html, len(html), now),
+        )
+        self._connection.execute(
+            "INSERT OR REPLACE INTO urls VALUES (?, ?, ?)",
+            (normalize_url(url), content_hash, now),
+        )
+        self._written()
+
+    def get_result(
+        self, content_hash: str, parser_cls: Type[Parser]
+    ) -> Optional[JobOffer]:
+        key = (content_hash, parser_cls.__name__, parser_cls.fingerprint())
+        row = self._connection.execute(
+            "SELECT offer, error FROM results WHERE content_hash = ? "
+            "AND parser_name = ? AND parser_fingerprint = ?",
+            key,
+        ).fetchone()
+        if row is None:
+            return None
+        self._touch(
+            "results",
+            "content_hash = ? AND parser_name = ? AND parser_fingerprint = ?",
+            key,
+        )
+        offer, error = row
+        if error is not None:
+            raise AttributeNotFoundError(error)
+        return JobOffer.from_dict(json.loads(offer))
+
+    def put_result(
+        self,
+        content_hash: str,
+        parser_cls: Type[Parser],
+        offer: Optional[JobOffer] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        serialized = json.dumps(offer.to_dict()) if offer is not None else None
+        self._connection.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                content_hash,
+                parser_cls.__name__,
+                parser_cls.fingerprint(),
+                serialized,
+                error,
+                len(serialized or error or ""),
+                time.time(),
+            ),
+        )
+        self._written()
+
+    def _touch(self, table: str, condition: str, parameters: Tuple[Any, ...]) -> None:
+        self._connection.execute(
+            f"UPDATE {table} SET accessed_at = ? WHERE {condition}",
+            (time.time(), *parameters),
+        )
+
+    def size(self) -> int:
+        pages_size, results_size = self._connection.execute(
+            "SELECT (SELECT COALESCE(SUM(size), 0) FROM pages), "
+            "(SELECT COALESCE(SUM(size), 0) FROM results)"
+        ).fetchone()
+        return int(pages_size + results_size)
+
+    def evict(self) -> None:
+        expired = time.time() - self._ttl
+        self._connection.execute("DELETE FROM urls WHERE fetched_at < ?", (expired,))
+        excess = self.size() - self._max_size
+        if excess <= 0:
+            return
+        entries = self._connection.execute(
+            "SELECT 'pages', rowid, size, accessed_at FROM pages "
+            "UNION ALL SELECT 'results', rowid, size, accessed_at FROM results "
+            "ORDER BY accessed_at"
+        ).fetchall()
+        for table, rowid, size, _ in entries:
+            self._connection.execute(f"DELETE FROM {table} WHERE rowid = ?", (rowid,))
+            excess -= size
+            if excess <= 0:
+                break
+        self._connection.execute(
+            "DELETE FROM urls "
+            "WHERE content_hash NOT IN (SELECT content_hash FROM pages)"
+        )
+
+
+_cache_enabled = CACHE_ENABLED
+_page_cache: Optional[PageCache] = None
+
+
+def set_cache_enabled(enabled: bool) -> None:
+    global _cache_enabled, _page_cache
+    _cache_enabled = enabled
+    _page_cache = None
+
+
+def is_cache_enabled() -> bool:
+    return _cache_enabled
+
+
+def get_page_cache() -> Optional[PageCache]:
+    global _page_cache
+    if _cache_enabled and _page_cache is None:
+        _page_cache = PageCache()
+    return _page_cache
+
+
+def close_page_cache() -> None:
+    global _page_cache
+    if _page_cache is not None:
+        _page_cache.close()
+        _page_cache = None
@@ -1,8 +1,53 @@
 import argparse
+import sys
 import textwrap
+from typing import List, Optional
 
+from job_offer_parser.archive import PACK_ACTIONS
+from job_offer_parser.dedupe import DEDUPE_MODES
+from job_offer_parser.parsers.backends import AUTO, BACKENDS
+from job_offer_parser.serializers import (
+    EXPORT_FORMATS,
+    JSONL_FORMAT,
+    OUTPUT_FORMATS,
+    TEXT_FORMAT,
+)
+from job_offer_parser.settings import (
+    BENCH_REPEAT,
+    BENCH_RESULTS_FILE,
+    BENCH_THRESHOLD,
+    CRAWL_CONCURRENCY,
+    CRAWL_RATE,
+    CRAWL_RETRIES,
+    CRAWL_TIMEOUT,
+    EXPORT_CHUNK_SIZE,
+    IMPORT_TIME_BUDGET,
+    OFFERS_DIR,
+    RAW_OFFERS_DIR,
+    SERVE_HOST,
+    SERVE_PORT,
+)
+from job_offer_parser.sources import STDIN_SOURCE
 
-def get_cli_arguments() -> str:
+PARSE_COMMAND = "parse"
+BATCH_COMMAND = "batch"
+EXPORT_COMMAND = "export"
+BENCH_COMMAND = "bench"
+CRAWL_COMMAND = "crawl"
+PACK_COMMAND = "pack"
+SERVE_COMMAND = "serve"
+COMMANDS = (
+    PARSE_COMMAND,
+    BATCH_COMMAND,
+    EXPORT_COMMAND,
+    BENCH_COMMAND,
+    PACK_COMMAND,
+    CRAWL_COMMAND,
+    SERVE_COMMAND,
+)
+
+
+def get_cli_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description=textwrap.dedent(
             """
@@ -14,10 +59,282 @@ def get_cli_arguments() -> str:
         ),
         formatter_class=argparse.RawTextHelpFormatter,
     )
-    parser.add_argument("source", help="Provide URL or filename with raw HTML content")
+    common_parser = argparse.ArgumentParser(add_help=False)
+    common_parser.add_argument(
+        "--backend",
+        choices=[AUTO, *BACKENDS],
+        default=None,
+        help="HTML tree builder (default: HTML_BACKEND setting)",
+    )
+    common_parser.add_argument(
+        "--stats-file",
+        default=None,
+        help="Persist parser success rates used to order parsers in this file",
+    )
+    common_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or write the page and parse result cache",
+    )
+    common_parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print time spent per stage, parser attribute and extractor",
+    )
+    common_parser.add_argument(
+        "--dedupe",
+        choices=DEDUPE_MODES,
+        default=None,
+        help="Flag or skip offers that nearly duplicate one seen before",
+    )
+
+    subparsers = parser.add_subparsers(dest="command", metavar="command")
+    subparsers.required = True
+
+    parse_parser = subparsers.add_parser(
+        PARSE_COMMAND,
+        parents=[common_parser],
+        help="Parse a single offer (default command)",
+    )
+    parse_parser.add_argument(
+        "source",
+        nargs="+",
+        help=f"Provide URLs or filenames with raw HTML content ('{STDIN_SOURCE}' reads "
+        "them from stdin, one per line)",
+    )
+    parse_parser.add_argument(
+        "-y",
+        "--non-interactive",
+        action="store_true",
+        help="Never prompt: name saved files automatically and print one JSON "
+        "status line per source; exit with 1 if any source was not parsed",
+    )
     # save_raw=True
     # save_output=True # default True
     # print_to_stdout=True # default True
 
-    args = parser.parse_args()
-    return str(args.source)
+    batch_parser = subparsers.add_parser(
+        BATCH_COMMAND,
+        parents=[common_parser],
+        help="Parse many saved offers in a process pool",
+    )
+    batch_parser.add_argument(
+        "source", help="Provide a directory or a glob pattern with raw HTML files"
+    )
+    batch_parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: number of CPUs)",
+    )
+    batch_parser.add_argument(
+        "--ordered",
+        action="store_true",
+        help="Print results in input order instead of as they finish",
+    )
+    batch_parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default=TEXT_FORMAT,
+        help="Print offers as text or as JSON Lines records",
+    )
+    batch_parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Skip files unchanged since the last incremental run",
+    )
+
+    export_parser = subparsers.add_parser(
+        EXPORT_COMMAND,
+        parents=[common_parser],
+        help="Export parsed offers as partitioned JSON Lines or Parquet files",
+    )
+    export_parser.add_argument(
+        "source",
+        nargs="?",
+        default=RAW_OFFERS_DIR,
+        help=f"Directory or glob pattern with raw HTML (default: {RAW_OFFERS_DIR})",
+    )
+    export_parser.add_argument(
+        "-o",
+        "--output",
+        default=OFFERS_DIR,
+        help=f"Output directory (default: {OFFERS_DIR})",
+    )
+    export_parser.add_argument("--format", choices=EXPORT_FORMATS, default=JSONL_FORMAT)
+    export_parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: number of CPUs)",
+    )
+    export_parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=EXPORT_CHUNK_SIZE,
+        help="Number of files parsed and written per chunk",
+    )
+    export_parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Ignore the checkpoint left by a previous export",
+    )
+    export_parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Export only new or changed files, or files whose parsers changed",
+    )
+
+    bench_parser = subparsers.add_parser(
+        BENCH_COMMAND,
+        parents=[common_parser],
+        help="Benchmark every candidate parser over a corpus of saved offers",
+    )
+    bench_parser.add_argument(
+        "source",
+        nargs="?",
+        default=RAW_OFFERS_DIR,
+        help=f"Directory or glob pattern with raw HTML (default: {RAW_OFFERS_DIR})",
+    )
+    bench_parser.add_argument(
+        "-o",
+        "--output",
+        default=BENCH_RESULTS_FILE,
+        help=f"JSON results file (default: {BENCH_RESULTS_FILE})",
+    )
+    bench_parser.add_argument(
+        "-n",
+        "--repeat",
+        type=int,
+        default=BENCH_REPEAT,
+        help="Best of N timings per measurement",
+    )
+    bench_parser.add_argument(
+        "--baseline", default=None, help="Compare against a previous results file"
+    )
+    bench_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=BENCH_THRESHOLD,
+        help="Relative slowdown reported as a regression (default: 0.2)",
+    )
+    bench_parser.add_argument(
+        "--import-budget",
+        type=float,
+        default=IMPORT_TIME_BUDGET,
+        help="Seconds the CLI may spend importing its modules at startup "
+        f"(default: {IMPORT_TIME_BUDGET})",
+    )
+
+    crawl_parser = subparsers.add_parser(
+        CRAWL_COMMAND,
+        parents=[common_parser],
+        help="Download, parse and save many offer URLs without prompting",
+    )
+    crawl_parser.add_argument(
+        "source",
+        nargs="+",
+        help=f"Offer URLs ('{STDIN_SOURCE}' reads them from stdin, one per line)",
+    )
+    crawl_parser.add_argument(
+        "-c",
+        "--concurrency",
+        type=int,
+        default=CRAWL_CONCURRENCY,
+        help=f"Downloads in flight across all portals (default: {CRAWL_CONCURRENCY})",
+    )
+    crawl_parser.add_argument(
+        "--rate",
+        type=float,
+        default=CRAWL_RATE,
+        help=f"Requests per second per portal (default: {CRAWL_RATE})",
+    )
+    crawl_parser.add_argument(
+        "--retries",
+        type=int,
+        default=CRAWL_RETRIES,
+        help=f"Retries of a failed download (default: {CRAWL_RETRIES})",
+    )
+    crawl_parser.add_argument(
+        "--timeout",
+        type=float,
+        default=CRAWL_TIMEOUT,
+        help=f"Seconds allowed per download attempt (default: {CRAWL_TIMEOUT})",
+    )
+    crawl_parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of parsing worker processes (default: number of CPUs)",
+    )
+
+    serve_parser = subparsers.add_parser(
+        SERVE_COMMAND,
+        parents=[common_parser],
+        help="Serve parse and fetch requests over HTTP with warm parsers",
+        description=textwrap.dedent(
+            """
+            POST /parse[?url=URL]: parse raw HTML sent as the request body
+            POST /fetch?url=URL[&save=1]: download and parse an offer
+            GET /health: check that the server is up
+            """
+        ),
+        formatter_class=argparse.RawTextHelpFormatter,
+    )
+    serve_parser.add_argument(
+        "--host", default=SERVE_HOST, help=f"Address to bind (default: {SERVE_HOST})"
+    )
+    serve_parser.add_argument(
+        "-p",
+        "--port",
+        type=int,
+        default=SERVE_PORT,
+        help=f"Port to listen on (default: {SERVE_PORT})",
+    )
+    serve_parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of parsing worker processes (default: number of CPUs)",
+    )
+    serve_parser.add_argument(
+        "-c",
+        "--concurrency",
+        type=int,
+        default=CRAWL_CONCURRENCY,
+        help=f"Downloads in flight across all portals (default: {CRAWL_CONCURRENCY})",
+    )
+    serve_parser.add_argument(
+        "--launch-browser",
+        action="store_true",
+        help="Start the browser at startup instead of on the first page needing it",
+    )
+
+    pack_parser = subparsers.add_parser(
+        PACK_COMMAND,
+        parents=[common_parser],
+        help="Manage a compressed pack of raw offers",
+        description=textwrap.dedent(
+            """
+            import: add HTML files from a directory (default: raw) to the pack
+            export: write every offer in the pack to a directory (default: raw)
+            cat: print an offer by its name, content hash or URL
+            ls: list offers in the pack
+            """
+        ),
+        formatter_class=argparse.RawTextHelpFormatter,
+    )
+    pack_parser.add_argument("action", choices=PACK_ACTIONS)
+    pack_parser.add_argument("archive", help="Pack file, e.g. raw.pack")
+    pack_parser.add_argument(
+        "target", nargs="?", help="Directory for import/export, key for cat"
+    )
+
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] not in COMMANDS and argv[0] not in ("-h", "--help"):
+        argv = [PARSE_COMMAND, *argv]
+    return parser.parse_args(argv)
@@ -0,0 +1,250 @@
+import hashlib
+import random
+import re
+import sqlite3
+import time
+from array import array
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Set
+
+from job_offer_parser.parsers.offer import JobOffer
+from job_offer_parser.settings import (
+    DEDUPE_BANDS,
+    DEDUPE_FILE,
+    DEDUPE_MODE,
+    DEDUPE_NUM_PERM,
+    DEDUPE_SHINGLE_SIZE,
+    DEDUPE_THRESHOLD,
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS offers (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL UNIQUE,
+    company TEXT NOT NULL,
+    title TEXT NOT NULL,
+    signature BLOB NOT NULL,
+    added_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS bands (
+    band_key TEXT NOT NULL,
+    offer_id INTEGER NOT NULL REFERENCES offers(id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS bands_band_key ON bands(band_key);
+CREATE INDEX IF NOT EXISTS bands_offer_id ON bands(offer_id);
+"""
+
+DEDUPE_FLAG = "flag"
+DEDUPE_SKIP = "skip"
+DEDUPE_MODES = (DEDUPE_FLAG, DEDUPE_SKIP)
+MERSENNE_PRIME = (1 << 61) - 1
+SIGNATURE_SEED = 20230101
+COMMIT_EVERY = 100
+WORD_PATTERN = re.compile(r"\w+")
+# Legal forms and country names that portals add to or drop from company names
+COMPANY_SUFFIX_WORDS = frozenset(
+    "sp z o oo s a sa spółka ograniczoną odpowiedzialnością akcyjna komandytowa "
+    "k j jawna gmbh ag inc ltd llc plc bv co corp group poland polska".split()
+)
+
+
+def normalize(text: str) -> str:
+    return " ".join(WORD_PATTERN.findall(text.lower()))
+
+
+def normalize_company(company: str) -> str:
+    "Company name without its legal form or spacing, e.g. acmesoftware"
+    words = normalize(company).split()
+    while len(words) > 1 and words[-1] in COMPANY_SUFFIX_WORDS:
+        words.pop()
+    return "".join(words)
+
+
+def get_shingles(offer: JobOffer, size: int = DEDUPE_SHINGLE_SIZE) -> Set[str]:
+    "Word n-grams of the title and description plus one token per technology"
+    words = normalize(f"{offer.title} {offer.description}").split()
+    shingles = {
+        " ".join(words[start:end])
+        for start, end in enumerate(range(size, max(len(words), size) + 1))
+    }
+    shingles.update(f"tech:{normalize(skill.name)}" for skill in offer.tech_stack)
+    return shingles
+
+
+def has_content(offer: JobOffer) -> bool:
+    "Whether the offer has more than a title to compare"
+    return bool(offer.description.strip() or offer.tech_stack)
+
+
+def _hash_shingle(shingle: str) -> int:
+    digest = hashlib.blake2b(shingle.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little") % MERSENNE_PRIME
+
+
+class MinHasher:
+    "MinHash signatures from universal hash functions (a * x + b) mod p"
+
+    def __init__(self, num_perm: int = DEDUPE_NUM_PERM) -> None:
+        generator = random.Random(SIGNATURE_SEED)
+        self.num_perm = num_perm
+        self._coefficients = [
+            (
+                generator.randrange(1, MERSENNE_PRIME),
+                generator.randrange(MERSENNE_PRIME),
+            )
+            for _ in range(num_perm)
+        ]
+
+    def signature(self, shingles: Iterable[str]) -> List[int]:
+        hashes = [_hash_shingle(shingle) for shingle in shingles] or [0]
+        return [
+            min((a * value + b) % MERSENNE_PRIME for value in hashes)
+            for a, b in self._coefficients
+        ]
+
+
+def estimate_similarity(first: List[int], second: List[int]) -> float:
+    "Estimated Jaccard similarity: the share of equal MinHash values"
+    return sum(a == b for a, b in zip(first, second)) / len(first)
+
+
+@dataclass
+class Duplicate:
+    source: str
+    similarity: float
+
+
+class DedupeIndex:
+    "Offers seen so far, found by LSH over MinHash signatures within a company"
+
+    def __init__(
+        self,
+        filename: str = DEDUPE_FILE,
+        num_perm: int = DEDUPE_NUM_PERM,
+        bands: int = DEDUPE_BANDS,
+        threshold: float = DEDUPE_THRESHOLD,
+    ) -> None:
+        if num_perm % bands:
+            raise ValueError("The number of permutations must be divisible by bands")
+        self._hasher = MinHasher(num_perm)
+        self._rows = num_perm // bands
+        self._threshold = threshold
+        self._uncommitted = 0
+        self._connection = sqlite3.connect(filename, timeout=30)
+        self._connection.execute("PRAGMA foreign_keys=ON")
+        self._connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.flush()
+        self._connection.close()
+
+    def flush(self) -> None:
+        self._connection.commit()
+        self._uncommitted = 0
+
+    def _band_keys(self, company: str, signature: List[int]) -> List[str]:
+        "One key per band of rows; offers of other companies never share a key"
+        bands = zip(*[iter(signature)] * self._rows)
+        return [
+            hashlib.sha1(f"{company}:{band}:{values}".encode()).hexdigest()[:16]
+            for band, values in enumerate(bands)
+        ]
+
+    def find(
+        self, source: str, offer: JobOffer, signature: Optional[List[int]] = None
+    ) -> Optional[Duplicate]:
+        "Most similar offer from another source, if it is similar enough"
+        signature = signature or self._hasher.signature(get_shingles(offer))
+        band_keys = self._band_keys(normalize_company(offer.company), signature)
+        rows = self._connection.execute(
+            "SELECT source, signature FROM offers WHERE source != ? AND id IN "
+            "(SELECT offer_id FROM bands WHERE band_key IN "
+            f"({', '.join('?' * len(band_keys))}))",
+            (source, *band_keys),
+        )
+        best: Optional[Duplicate] = None
+        for candidate, packed in rows:
+            similarity = estimate_similarity(signature, list(array("Q", packed)))
+            if similarity >= self._threshold and (
+                best is None or similarity > best.similarity
+            ):
+                best = Duplicate(candidate, similarity)
+        return best
+
+    def add(
+        self, source: str, offer: JobOffer, signature: Optional[List[int]] = None
+    ) -> None:
+        signature = signature or self._hasher.signature(get_shingles(offer))
+        company = normalize_company(offer.company)
+        self._connection.execute("DELETE FROM offers WHERE source = ?", (source,))
+        cursor = self._connection.execute(
+            "INSERT INTO offers (source, company, title, signature, added_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (
+                source,
+                company,
+                normalize(offer.title),
+                array("Q", signature).tobytes(),
+                time.time(),
+            ),
+        )
+        self._connection.executemany(
+            "INSERT INTO bands (band_key, offer_id) VALUES (?, ?)",
+            [
+                (band_key, cursor.lastrowid)
+                for band_key in self._band_keys(company, signature)
+            ],
+        )
+        self._uncommitted += 1
+        if self._uncommitted >= COMMIT_EVERY:
+            self.flush()
+
+    def check(self, source: str, offer: JobOffer) -> Optional[Duplicate]:
+        "Find an earlier copy of the offer, or remember the offer as new"
+        # A bare title matches every other offer of the company with that title
+        if not has_content(offer):
+            return None
+        signature = self._hasher.signature(get_shingles(offer))
+        duplicate = self.find(source, offer, signature)
+        if duplicate is None:
+            self.add(source, offer, signature)
+        return duplicate
+
+
+_dedupe_mode: Optional[str] = DEDUPE_MODE
+_dedupe_index: Optional[DedupeIndex] = None
+
+
+def set_dedupe_mode(mode: Optional[str]) -> None:
+    global _dedupe_mode
+    if mode is not None and mode not in DEDUPE_MODES:
+        raise ValueError(f"Unknown dedupe mode: {mode}")
+    close_dedupe_index()
+    _dedupe_mode = mode
+
+
+def should_skip_duplicates() -> bool:
+    return _dedupe_mode == DEDUPE_SKIP
+
+
+def get_dedupe_index() -> Optional[DedupeIndex]:
+    global _dedupe_index
+    if _dedupe_mode and _dedupe_index is None:
+        _dedupe_index = DedupeIndex()
+    return _dedupe_index
+
+
+def close_dedupe_index() -> None:
+    global _dedupe_index
+    if _dedupe_index is not None:
+        _dedupe_index.close()
+        _dedupe_index = None
+
+
+def find_duplicate(source: str, offer: JobOffer) -> str:
+    "Source of an earlier copy of the offer; new offers are added to the index"
+    dedupe_index = get_dedupe_index()
+    if dedupe_index is None:
+        return ""
+    duplicate = dedupe_index.check(source, offer)
+    return duplicate.source if duplicate else ""
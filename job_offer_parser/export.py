@@ -0,0 +1,296 @@
+import glob
+import json
+import os
+import re
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from job_offer_parser.batch import (
+    BatchResult,
+    BatchSummary,
+    collect_sources,
+    create_executor,
+    parse_file,
+    record_result,
+)
+from job_offer_parser.manifest import Manifest
+from job_offer_parser.parser_stats import get_parser_stats
+from job_offer_parser.serializers import JSONL_FORMAT, PARQUET_FORMAT
+from job_offer_parser.settings import EXPORT_CHUNK_SIZE, MANIFEST_FILE, OFFERS_DIR
+
+CHECKPOINT_FILENAME = ".export-checkpoint.json"
+UNKNOWN_PARTITION = "unknown"
+DATE_PREFIX_PATTERN = re.compile(r"^(\d{6}) ")
+PART_PATTERN = os.path.join("portal=*", "date=*", "part-*.*")
+
+Partition = Tuple[str, str]
+
+
+@dataclass
+class Checkpoint:
+    last_filename: str = ""
+    chunk: int = 0
+    exported: int = 0
+    failed: int = 0
+
+    @classmethod
+    def load(cls, filename: str) -> "Checkpoint":
+        if not os.path.exists(filename):
+            return cls()
+        with open(filename, "r") as file:
+            return cls(**json.load(file))
+
+    def finish(self, filename: str, incremental: bool) -> None:
+        "Forget the resume position; incremental exports keep numbering chunks"
+        if incremental:
+            Checkpoint(chunk=self.chunk).save(filename)
+        elif os.path.exists(filename):
+            os.remove(filename)
+
+    def save(self, filename: str) -> None:
+        temporary_filename = f"{filename}.tmp"
+        with open(temporary_filename, "w") as file:
+            json.dump(asdict(self), file, indent=2)
+        os.replace(temporary_filename, filename)
+
+
+def get_offer_date(filename: str) -> str:
+    match = DATE_PREFIX_PATTERN.match(os.path.basename(filename))
+    if not match:
+        return UNKNOWN_PARTITION
+    try:
+        return datetime.strptime(match.group(1), "%y%m%d").date().isoformat()
+    except ValueError:
+        return UNKNOWN_PARTITION
+
+
+def to_record(result: BatchResult) -> Dict[str, Any]:
+    assert result.offer is not None
+    return {
+        "source": result.filename,
+        "portal": result.portal,
+        "parser": result.parser_name,
+        "date": get_offer_date(result.filename),
+        **result.offer.to_dict(),
+    }
+
+
+def partition_records(
+    results: List[BatchResult],
+) -> Dict[Partition, List[Dict[str, Any]]]:
+    partitions: Dict[Partition, List[Dict[str, Any]]] = {}
+    for result in results:
+        if not result.ok:
+            continue
+        record = to_record(result)
+        partition = (record["portal"] or UNKNOWN_PARTITION, record["date"])
+        partitions.setdefault(partition, []).append(record)
+    return partitions
+
+
+def get_partition_dir(output_dir: str, partition: Partition) -> str:
+    portal, offer_date = partition
+    return os.path.join(output_dir, f"portal={portal}", f"date={offer_date}")
+
+
+def write_jsonl(filename: str, records: List[Dict[str, Any]]) -> None:
+    with open(filename, "w") as file:
+        for record in records:
+            file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def get_parquet_schema(pyarrow: Any) -> Any:
+    "One schema for every part, so that empty lists do not become list<null>"
+    string, number = pyarrow.string(), pyarrow.float64()
+    return pyarrow.schema(
+        [
+            ("source", string),
+            ("portal", string),
+            ("parser", string),
+            ("date", string),
+            ("company", string),
+            ("title", string),
+            ("company_url", string),
+            ("locations", pyarrow.list_(string)),
+            (
+                "salaries",
+                pyarrow.list_(
+                    pyarrow.struct(
+                        [
+                            ("text", string),
+                            ("minimum", number),
+                            ("maximum", number),
+                            ("currency", string),
+                        ]
+                    )
+                ),
+            ),
+            (
+                "details",
+                pyarrow.list_(pyarrow.struct([("name", string), ("value", string)])),
+            ),
+            (
+                "tech_stack",
+                pyarrow.list_(pyarrow.struct([("name", string), ("level", string)])),
+            ),
+            ("description", string),
+        ]
+    )
+
+
+def write_parquet(filename: str, records: List[Dict[str, Any]]) -> None:
+    try:
+        import pyarrow  # type: ignore
+        import pyarrow.parquet  # type: ignore
+    except ImportError:
+        raise ImportError("pyarrow is required for Parquet export: pip install pyarrow")
+    rows = [
+        {
+            **record,
+            "details": [
+                {"name": name, "value": value}
+                for name, value in record["details"].items()
+            ],
+        }
+        for record in records
+    ]
+    table = pyarrow.Table.from_pylist(rows, schema=get_parquet_schema(pyarrow))
+    pyarrow.parquet.write_table(table, filename)
+
+
+def remove_jsonl_records(filename: str, sources: Set[str]) -> int:
+    with open(filename, "r") as file:
+        lines = [
+            line
+            for line in file
+            if os.path.abspath(json.loads(line)["source"]) not in sources
+        ]
+    with open(filename, "w") as file:
+        file.writelines(lines)
+    return len(lines)
+
+
+def remove_parquet_records(filename: str, sources: Set[str]) -> int:
+    import pyarrow  # type: ignore
+    import pyarrow.parquet  # type: ignore
+
+    table = pyarrow.parquet.read_table(filename)
+    mask = [
+        os.path.abspath(source) not in sources
+        for source in table.column("source").to_pylist()
+    ]
+    if not all(mask):
+        table = table.filter(pyarrow.array(mask, type=pyarrow.bool_()))
+        pyarrow.parquet.write_table(table, filename)
+    return int(table.num_rows)
+
+
+WRITERS = {JSONL_FORMAT: write_jsonl, PARQUET_FORMAT: write_parquet}
+REMOVERS = {JSONL_FORMAT: remove_jsonl_records, PARQUET_FORMAT: remove_parquet_records}
+
+
+def list_parts(output_dir: str) -> List[str]:
+    return sorted(glob.glob(os.path.join(output_dir, PART_PATTERN)))
+
+
+def remove_records(output_dir: str, sources: Set[str]) -> None:
+    "Drop earlier records of re-exported files, so every file has one record"
+    if not sources:
+        return
+    for filename in list_parts(output_dir):
+        output_format = os.path.splitext(filename)[1][1:]
+        if not REMOVERS[output_format](filename, sources):
+            os.remove(filename)
+
+
+def remove_parts(output_dir: str) -> None:
+    for filename in list_parts(output_dir):
+        os.remove(filename)
+
+
+def write_chunk(
+    output_dir: str,
+    output_format: str,
+    chunk: int,
+    partitions: Dict[Partition, List[Dict[str, Any]]],
+) -> None:
+    for partition, records in partitions.items():
+        partition_dir = get_partition_dir(output_dir, partition)
+        os.makedirs(partition_dir, exist_ok=True)
+        filename = os.path.join(partition_dir, f"part-{chunk:06d}.{output_format}")
+        WRITERS[output_format](filename, records)
+
+
+def select_sources(
+    source: str, output_dir: str, checkpoint: Checkpoint, incremental: bool
+) -> Tuple[Manifest, List[str]]:
+    "Files to export, with the manifest of what the output directory holds"
+    manifest_filename = os.path.join(output_dir, MANIFEST_FILE)
+    filenames = collect_sources(source)
+    if incremental:
+        manifest = Manifest(manifest_filename)
+        filenames = manifest.select_changed(filenames)
+        remove_records(output_dir, manifest.select_recorded(filenames))
+        return manifest, filenames
+    if not checkpoint.last_filename:
+        # A full run that is not resumed replaces everything exported before
+        remove_parts(output_dir)
+        if os.path.exists(manifest_filename):
+            os.remove(manifest_filename)
+    filenames = [
+        filename for filename in filenames if filename > checkpoint.last_filename
+    ]
+    return Manifest(manifest_filename), filenames
+
+
+def export(
+    source: str,
+    output_dir: str = OFFERS_DIR,
+    output_format: str = JSONL_FORMAT,
+    workers: Optional[int] = None,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+    restart: bool = False,
+    incremental: bool = False,
+) -> None:
+    os.makedirs(output_dir, exist_ok=True)
+    checkpoint_filename = os.path.join(output_dir, CHECKPOINT_FILENAME)
+    checkpoint = Checkpoint() if restart else Checkpoint.load(checkpoint_filename)
+    manifest, filenames = select_sources(source, output_dir, checkpoint, incremental)
+    summary = BatchSummary()
+    parser_stats = get_parser_stats()
+    start = time.perf_counter()
+    with create_executor(workers) as executor:
+        for offset in range(0, len(filenames), chunk_size):
+            end = offset + chunk_size
+            chunk_filenames = filenames[offset:end]
+            results = list(executor.map(parse_file, chunk_filenames, chunksize=8))
+            checkpoint.chunk += 1
+            write_chunk(
+                output_dir, output_format, checkpoint.chunk, partition_records(results)
+            )
+            for result in results:
+                record_result(parser_stats, result)
+                manifest.record(result)
+                if not result.ok:
+                    print(f"Failed {result.filename}: {result.error}", file=sys.stderr)
+            parsed = sum(result.ok for result in results)
+            summary.parsed += parsed
+            summary.failed += len(results) - parsed
+            checkpoint.exported += parsed
+            checkpoint.failed += len(results) - parsed
+            checkpoint.last_filename = chunk_filenames[-1]
+            manifest.flush()
+            checkpoint.save(checkpoint_filename)
+    checkpoint.finish(checkpoint_filename, incremental)
+    summary.elapsed = time.perf_counter() - start
+    parser_stats.save()
+    manifest.close()
+    print(
+        f"Exported {summary.parsed}/{summary.total} files, {summary.failed} failed "
+        f"in {summary.elapsed:.2f}s ({summary.throughput:.1f} files/s) "
+        f"to {output_dir}",
+        file=sys.stderr,
+    )
@@ -0,0 +1,84 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from email.message import Message
+from enum import auto
+from typing import Optional
+
+import urllib3
+from job_offer_parser.browser import BrowserPool
+from job_offer_parser.instrumentation import span
+from job_offer_parser.module_exceptions import DownloadError, NoParserFound
+from job_offer_parser.parsers.base_parser import AutoNameEnum
+from job_offer_parser.settings import HTTP_TIMEOUT, HTTP_USER_AGENT
+from job_offer_parser.utils import (
+    download_page,
+    get_portal_from_url,
+    get_portal_parsers,
+)
+
+HTTP_HEADERS = urllib3.make_headers(
+    keep_alive=True, accept_encoding=True, user_agent=HTTP_USER_AGENT
+)
+
+_http_pool: Optional[urllib3.PoolManager] = None
+
+
+class FetchStrategy(AutoNameEnum):
+    HTTP = auto()
+    BROWSER = auto()
+
+
+@dataclass
+class FetchResult:
+    url: str
+    page_content: str
+    strategy: FetchStrategy
+    elapsed: float
+
+
+def get_http_pool() -> urllib3.PoolManager:
+    global _http_pool
+    if _http_pool is None:
+        _http_pool = urllib3.PoolManager(headers=HTTP_HEADERS)
+    return _http_pool
+
+
+def select_strategy(url: str) -> FetchStrategy:
+    try:
+        parsers = get_portal_parsers(get_portal_from_url(url))
+    except NoParserFound:
+        return FetchStrategy.BROWSER
+    if any(parser_cls.requires_js_rendering for parser_cls in parsers):
+        return FetchStrategy.BROWSER
+    return FetchStrategy.HTTP
+
+
+def http_download(url: str, timeout: float = HTTP_TIMEOUT) -> str:
+    response = get_http_pool().request("GET", url, timeout=timeout)
+    if response.status >= 400:
+        raise DownloadError(
+            f"Downloading {url} failed with HTTP {response.status}", response.status
+        )
+    message = Message()
+    message["content-type"] = response.headers.get("content-type", "")
+    charset = message.get_content_charset() or "utf-8"
+    page_content: str = response.data.decode(charset, errors="replace")
+    return page_content
+
+
+async def fetch_page(
+    url: str,
+    browser_pool: Optional[BrowserPool] = None,
+    strategy: Optional[FetchStrategy] = None,
+) -> FetchResult:
+    strategy = strategy or select_strategy(url)
+    start = time.perf_counter()
+    with span("fetch", strategy.value):
+        if strategy == FetchStrategy.HTTP:
+            page_content = await asyncio.to_thread(http_download, url)
+        elif browser_pool is not None:
+            page_content = await browser_pool.download(url)
+        else:
+            page_content = await download_page(url)
+    return FetchResult(url, page_content, strategy, time.perf_counter() - start)
@@ -0,0 +1,169 @@
+import functools
+import sys
+import time
+from dataclasses import dataclass
+from typing import IO, Any, Callable, ContextManager, Dict, List, Optional, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+@dataclass
+class SpanRecord:
+    name: str
+    label: str
+    start: float
+    elapsed: float
+    failed: bool = False
+
+    @property
+    def key(self) -> str:
+        return f"{self.name} {self.label}" if self.label else self.name
+
+
+@dataclass
+class StageStats:
+    count: int = 0
+    failures: int = 0
+    total: float = 0.0
+    maximum: float = 0.0
+
+    def add(self, elapsed: float, failed: bool = False) -> None:
+        self.count += 1
+        self.failures += failed
+        self.total += elapsed
+        self.maximum = max(self.maximum, elapsed)
+
+    def merge(self, other: "StageStats") -> None:
+        self.count += other.count
+        self.failures += other.failures
+        self.total += other.total
+        self.maximum = max(self.maximum, other.maximum)
+
+
+SpanHook = Callable[[SpanRecord], None]
+Profile = Dict[str, StageStats]
+
+
+class Profiler:
+    "Timers and counters aggregated per stage and per parser attribute"
+
+    def __init__(self) -> None:
+        self.stages: Profile = {}
+
+    def add(self, record: SpanRecord) -> None:
+        self.stages.setdefault(record.key, StageStats()).add(
+            record.elapsed, record.failed
+        )
+
+    def merge(self, stages: Profile) -> None:
+        for key, stats in stages.items():
+            self.stages.setdefault(key, StageStats()).merge(stats)
+
+    def pop_stages(self) -> Profile:
+        stages, self.stages = self.stages, {}
+        return stages
+
+    def report(self) -> List[str]:
+        lines = [f"{'stage':<48} {'count':>7} {'total ms':>10} {'mean ms':>9}"]
+        for key, stats in sorted(
+            self.stages.items(), key=lambda item: item[1].total, reverse=True
+        ):
+            failures = f" ({stats.failures} failed)" if stats.failures else ""
+            lines.append(
+                f"{key:<48} {stats.count:>7} {stats.total * 1000:>10.2f} "
+                f"{stats.total / stats.count * 1000:>9.3f}{failures}"
+            )
+        return lines
+
+
+class Span:
+    __slots__ = ("name", "label", "start")
+
+    def __init__(self, name: str, label: str = "") -> None:
+        self.name = name
+        self.label = label
+        self.start = 0.0
+
+    def __enter__(self) -> "Span":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        record = SpanRecord(
+            self.name,
+            self.label,
+            self.start,
+            time.perf_counter() - self.start,
+            exc_type is not None,
+        )
+        if _profiler is not None:
+            _profiler.add(record)
+        for hook in _hooks:
+            hook(record)
+
+
+class NullSpan:
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        return None
+
+
+NULL_SPAN = NullSpan()
+
+_profiler: Optional[Profiler] = None
+_hooks: List[SpanHook] = []
+_enabled = False
+
+
+def _update_enabled() -> None:
+    global _enabled
+    _enabled = _profiler is not None or bool(_hooks)
+
+
+def set_profiler(profiler: Optional[Profiler]) -> None:
+    global _profiler
+    _profiler = profiler
+    _update_enabled()
+
+
+def get_profiler() -> Optional[Profiler]:
+    return _profiler
+
+
+def add_span_hook(hook: SpanHook) -> None:
+    _hooks.append(hook)
+    _update_enabled()
+
+
+def remove_span_hook(hook: SpanHook) -> None:
+    _hooks.remove(hook)
+    _update_enabled()
+
+
+def span(name: str, label: str = "") -> ContextManager[Any]:
+    return Span(name, label) if _enabled else NULL_SPAN
+
+
+def timed(name: Optional[str] = None) -> Callable[[F], F]:
+    def decorator(function: F) -> F:
+        stage, label = (
+            (name, function.__qualname__) if name else (function.__qualname__, "")
+        )
+
+        @functools.wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _enabled:
+                return function(*args, **kwargs)
+            with Span(stage, label):
+                return function(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def print_profile(file: IO[str] = sys.stderr) -> None:
+    if _profiler is not None and _profiler.stages:
+        print("\n".join(_profiler.report()), file=file)
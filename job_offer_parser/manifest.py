@@ -0,0 +1,138 @@
+import hashlib
+import os
+import sqlite3
+import time
+from typing import TYPE_CHECKING, Dict, List, Set, Tuple
+
+from job_offer_parser.archive import get_source_signature, read_raw_offer
+from job_offer_parser.module_exceptions import NoParserFound
+from job_offer_parser.parsers.document import Document
+from job_offer_parser.settings import MANIFEST_FILE, MANIFEST_FLUSH_SIZE
+from job_offer_parser.utils import get_portal_parsers
+
+if TYPE_CHECKING:
+    from job_offer_parser.batch import BatchResult
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    portal TEXT NOT NULL,
+    parser_name TEXT NOT NULL,
+    parser_version INTEGER NOT NULL,
+    fingerprint TEXT NOT NULL,
+    error TEXT NOT NULL,
+    parsed_at REAL NOT NULL
+);
+"""
+
+ManifestRow = Tuple[str, int, int, str, str, str, int, str, str, float]
+SignatureUpdate = Tuple[int, int, str]
+
+
+class Manifest:
+    "Raw files processed by previous runs and the parsers that handled them"
+
+    def __init__(
+        self, filename: str = MANIFEST_FILE, flush_size: int = MANIFEST_FLUSH_SIZE
+    ) -> None:
+        self._connection = sqlite3.connect(filename, timeout=30)
+        self._connection.executescript(SCHEMA)
+        self._fingerprints: Dict[str, str] = {}
+        self._pending: List[ManifestRow] = []
+        self._signatures: List[SignatureUpdate] = []
+        self._flush_size = flush_size
+
+    def close(self) -> None:
+        self.flush()
+        self._connection.close()
+
+    def portal_fingerprint(self, portal: str) -> str:
+        if portal not in self._fingerprints:
+            try:
+                parsers = get_portal_parsers(portal)
+            except NoParserFound:
+                parsers = []
+            fingerprints = sorted(parser_cls.fingerprint() for parser_cls in parsers)
+            self._fingerprints[portal] = hashlib.sha1(
+                "\n".join(fingerprints).encode()
+            ).hexdigest()
+        return self._fingerprints[portal]
+
+    def select_changed(self, filenames: List[str]) -> List[str]:
+        known = {
+            path: entry
+            for path, *entry in self._connection.execute(
+                "SELECT path, size, mtime_ns, content_hash, portal, fingerprint "
+                "FROM files"
+            )
+        }
+        changed = []
+        for filename in filenames:
+            entry = known.get(os.path.abspath(filename))
+            if entry is None or self._is_changed(filename, *entry):
+                changed.append(filename)
+        self.flush()
+        return changed
+
+    def select_recorded(self, filenames: List[str]) -> Set[str]:
+        "Absolute paths of the files recorded by previous runs"
+        paths = {os.path.abspath(filename) for filename in filenames}
+        return {
+            path
+            for (path,) in self._connection.execute("SELECT path FROM files")
+            if path in paths
+        }
+
+    def _is_changed(
+        self,
+        filename: str,
+        size: int,
+        mtime_ns: int,
+        content_hash: str,
+        portal: str,
+        fingerprint: str,
+    ) -> bool:
+        if fingerprint != self.portal_fingerprint(portal):
+            return True
+        signature = get_source_signature(filename)
+        if signature == (size, mtime_ns):
+            return False
+        # A touched or copied file is only parsed again if its content differs
+        if Document(read_raw_offer(filename)).content_hash != content_hash:
+            return True
+        self._signatures.append((*signature, os.path.abspath(filename)))
+        return False
+
+    def record(self, result: "BatchResult") -> None:
+        self._pending.append(
+            (
+                os.path.abspath(result.filename),
+                *get_source_signature(result.filename),
+                result.content_hash,
+                result.portal,
+                result.parser_name,
+                result.parser_version,
+                self.portal_fingerprint(result.portal),
+                result.error,
+                time.time(),
+            )
+        )
+        if len(self._pending) >= self._flush_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not (self._pending or self._signatures):
+            return
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                self._pending,
+            )
+            self._connection.executemany(
+                "UPDATE files SET size = ?, mtime_ns = ? WHERE path = ?",
+                self._signatures,
+            )
+        self._pending, self._signatures = [], []
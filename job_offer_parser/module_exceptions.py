@@ -4,3 +4,15 @@ class AttributeNotFoundError(Exception):
 
 class NoParserFound(Exception):
     pass
+
+
+class CorruptArchiveError(Exception):
+    "Indicate that a pack record is truncated or does not match its hash"
+
+
+class DownloadError(Exception):
+    "Indicate that a page could not be downloaded"
+
+    def __init__(self, message: str, status: int = 0) -> None:
+        super().__init__(message)
+        self.status = status
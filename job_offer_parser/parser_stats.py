@@ -0,0 +1,80 @@
+import json
+import os
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Sequence, Type
+
+from job_offer_parser.parsers.base_parser import Parser
+from job_offer_parser.parsers.registry import normalize_hostname
+from job_offer_parser.settings import PARSER_STATS_DECAY, PARSER_STATS_FILE
+
+
+@dataclass
+class ParserScore:
+    successes: float = 0.0
+    failures: float = 0.0
+
+    @property
+    def success_rate(self) -> float:
+        return (self.successes + 1) / (self.successes + self.failures + 2)
+
+
+class ParserStats:
+    "Recent success/failure counters per portal used to order candidate parsers"
+
+    def __init__(
+        self, filename: Optional[str] = None, decay: float = PARSER_STATS_DECAY
+    ) -> None:
+        self.filename = filename
+        self._decay = decay
+        self._scores: Dict[str, Dict[str, ParserScore]] = {}
+        if filename and os.path.exists(filename):
+            self.load()
+
+    def _get_score(self, portal: str, parser_name: str) -> ParserScore:
+        portal_scores = self._scores.setdefault(normalize_hostname(portal), {})
+        return portal_scores.setdefault(parser_name, ParserScore())
+
+    def record(self, portal: str, parser_name: str, success: bool) -> None:
+        score = self._get_score(portal, parser_name)
+        score.successes = score.successes * self._decay + success
+        score.failures = score.failures * self._decay + (not success)
+
+    def order(self, portal: str, parsers: Sequence[Type[Parser]]) -> List[Type[Parser]]:
+        portal_scores = self._scores.get(normalize_hostname(portal), {})
+        return sorted(
+            parsers,
+            key=lambda parser_cls: -portal_scores.get(
+                parser_cls.__name__, ParserScore()
+            ).success_rate,
+        )
+
+    def load(self) -> None:
+        assert self.filename
+        with open(self.filename, "r") as file:
+            content = json.load(file)
+        self._scores = {
+            portal: {name: ParserScore(**score) for name, score in scores.items()}
+            for portal, scores in content.items()
+        }
+
+    def save(self) -> None:
+        if not self.filename:
+            return
+        content = {
+            portal: {name: asdict(score) for name, score in scores.items()}
+            for portal, scores in self._scores.items()
+        }
+        with open(self.filename, "w") as file:
+            json.dump(content, file, indent=2)
+
+
+_parser_stats = ParserStats(PARSER_STATS_FILE)
+
+
+def set_parser_stats(parser_stats: ParserStats) -> None:
+    global _parser_stats
+    _parser_stats = parser_stats
+
+
+def get_parser_stats() -> ParserStats:
+    return _parser_stats
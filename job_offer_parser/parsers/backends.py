@@ -0,0 +1,77 @@
+import re
+import warnings
+from typing import TYPE_CHECKING, Callable, Iterable, List, Optional, Tuple
+
+from job_offer_parser.settings import HTML_BACKEND
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
+AUTO = "auto"
+LXML = "lxml"
+HTML_PARSER = "html.parser"
+BACKENDS = (LXML, HTML_PARSER)
+SKIPPED_CONTENT_PATTERN = re.compile(
+    r"<(script|style)\b[^>]*>.*?</\1\s*>", re.IGNORECASE | re.DOTALL
+)
+
+_backend = HTML_BACKEND
+
+
+def available_backends() -> List[str]:
+    from bs4.builder import builder_registry  # type: ignore[attr-defined]
+
+    return [backend for backend in BACKENDS if builder_registry.lookup(backend)]
+
+
+def resolve_backend(backend: str) -> str:
+    if backend == AUTO:
+        return available_backends()[0]
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown HTML backend: {backend}")
+    if backend not in available_backends():
+        warnings.warn(f"{backend} is not installed, falling back to {HTML_PARSER}")
+        return HTML_PARSER
+    return backend
+
+
+def set_backend(backend: str) -> None:
+    global _backend
+    _backend = resolve_backend(backend)
+
+
+def get_backend() -> str:
+    return resolve_backend(_backend)
+
+
+def match_classes(classes: Iterable[str]) -> Callable[[Optional[str]], bool]:
+    "Match a class attribute by any of its classes or the whole value, like the index"
+    wanted = frozenset(classes)
+
+    def matches(value: Optional[str]) -> bool:
+        if not value:
+            return False
+        if not isinstance(value, str):
+            value = " ".join(value)
+        return value in wanted or not wanted.isdisjoint(value.split())
+
+    return matches
+
+
+def build_soup(
+    text: str,
+    backend: Optional[str] = None,
+    parse_only: Optional[Iterable[Tuple[str, str]]] = None,
+) -> "BeautifulSoup":
+    "Build a tree without script and style blocks, only of `parse_only` subtrees"
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    features = resolve_backend(backend) if backend else get_backend()
+    strainer = None
+    if parse_only:
+        tags, classes = zip(*parse_only)
+        strainer = SoupStrainer(
+            name=sorted(set(tags)), attrs={"class": match_classes(classes)}
+        )
+    text = SKIPPED_CONTENT_PATTERN.sub("", text)
+    return BeautifulSoup(text, features=features, parse_only=strainer)
@@ -1,10 +1,46 @@
+import hashlib
+import inspect
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from enum import StrEnum, auto
-from typing import Any, Dict, List, Optional, Protocol, Union
+from functools import cached_property, partial
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Protocol,
+    Tuple,
+    Union,
+)
 
-from bs4 import BeautifulSoup, PageElement, Tag
+from job_offer_parser.instrumentation import span
 from job_offer_parser.module_exceptions import AttributeNotFoundError
+from job_offer_parser.parsers.backends import get_backend
+from job_offer_parser.parsers.document import Document, PageSource, as_document
+from job_offer_parser.parsers.embedded import (
+    EMBEDDED_DATA_VERSION,
+    find_job_posting,
+    find_next_data,
+    job_posting_to_offer,
+)
+from job_offer_parser.parsers.offer import (
+    EXTRACTION_VERSION,
+    OFFER_FIELDS,
+    FieldExtractors,
+    JobOffer,
+    LazyOffer,
+    render_offer,
+)
+from job_offer_parser.parsers.registry import REGISTRY
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup, Tag
+    from job_offer_parser.parsers.selector_index import SelectorIndex, SelectorKey
 
 
 class AutoNameEnum(StrEnum):
@@ -29,6 +65,10 @@ class Selector:
     html: str
     class_: str
 
+    @property
+    def key(self) -> "SelectorKey":
+        return self.html, self.class_
+
 
 class Selectors:
     def __init__(self, selectors: Dict[str, Selector]) -> None:
@@ -37,6 +77,29 @@ class Selectors:
     def get_html_tags(self, attribute: str) -> Selector:
         return self._selectors[attribute]
 
+    def __iter__(self) -> Iterator[Selector]:
+        return iter(self._selectors.values())
+
+    def items(self) -> Iterator[Tuple[str, Selector]]:
+        return iter(self._selectors.items())
+
+    def get_keys(
+        self, attributes: Tuple[str, ...] = ()
+    ) -> Optional[FrozenSet["SelectorKey"]]:
+        "Keys of the given attributes, or of all; None if a selector has no class"
+        selectors = (
+            [self.get_html_tags(attribute) for attribute in attributes]
+            if attributes
+            else list(self)
+        )
+        if not selectors or not all(selector.class_ for selector in selectors):
+            return None
+        return frozenset(selector.key for selector in selectors)
+
+    def fingerprint(self) -> str:
+        content = repr(sorted(self._selectors.items()))
+        return hashlib.sha1(content.encode()).hexdigest()
+
 
 class BaseAttributes(AutoNameEnum):
     COMPANY_NAME = auto()
@@ -45,9 +108,33 @@ class BaseAttributes(AutoNameEnum):
 
 class Parser(ABC):
     portal_identifier = ""
+    hostnames: Tuple[str, ...] = ()
+    parser_priority = 0
+    parser_version = 1
+    requires_js_rendering = True
+    default_selectors: Optional[Selectors] = None
+    use_embedded_data = True
+    next_data_keys: Tuple[str, ...] = ()
+    strain_document = True
+    container_attributes: Tuple[str, ...] = ()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        if (cls.portal_identifier or cls.hostnames) and not inspect.isabstract(cls):
+            REGISTRY.register(cls)
 
-    def __init__(self, text: str) -> None:
-        self._text = text
+    def __init__(self, text: PageSource) -> None:
+        self._document = as_document(text)
+        self._text = self._document.text
+        self._document.restrict_to(self.get_container_keys())
+
+    @property
+    def document(self) -> Document:
+        return self._document
+
+    def get_container_keys(self) -> Optional[FrozenSet["SelectorKey"]]:
+        "Keys of the subtrees the parser reads, or None if it needs the whole page"
+        return None
 
     @abstractmethod
     def get_company_name(self) -> str:
@@ -57,52 +144,119 @@ class Parser(ABC):
     def get_job_title(self) -> str:
         pass
 
+    @classmethod
+    def fingerprint(cls) -> str:
+        selectors = cls.default_selectors.fingerprint() if cls.default_selectors else ""
+        embedded = f"embedded{EMBEDDED_DATA_VERSION}" if cls.use_embedded_data else ""
+        backend = get_backend()
+        version = f"{cls.parser_version}.{EXTRACTION_VERSION}"
+        return f"{cls.__name__}:{version}:{selectors}:{embedded}:{backend}"
+
     @classmethod
     def meets_condition(cls, portal: str) -> bool:
         return cls.portal_identifier in portal if cls.portal_identifier else False
 
-    @abstractmethod
+    @cached_property
+    def embedded_offer(self) -> Optional[JobOffer]:
+        "Offer read from JSON embedded in the page, found without building a DOM"
+        if not self.use_embedded_data:
+            return None
+        with span("extract_embedded", self.__class__.__name__):
+            try:
+                return self._read_embedded_offer()
+            except (AttributeError, KeyError, TypeError, ValueError):
+                return None
+
+    def _read_embedded_offer(self) -> Optional[JobOffer]:
+        if self.next_data_keys:
+            data = find_next_data(self._text, self.next_data_keys)
+            offer = self.offer_from_next_data(data) if data else None
+            if offer is not None:
+                return offer
+        posting = find_job_posting(self._text)
+        return job_posting_to_offer(posting) if posting else None
+
+    def offer_from_next_data(self, data: Dict[str, Any]) -> Optional[JobOffer]:
+        return None
+
+    @cached_property
+    def offer_view(self) -> LazyOffer:
+        "Offer whose fields are extracted on first access, from embedded JSON first"
+        offer = self.embedded_offer
+        if offer is not None:
+            return LazyOffer(
+                {name: partial(getattr, offer, name) for name in OFFER_FIELDS}
+            )
+        return LazyOffer(self.get_field_extractors())
+
+    def get_field_extractors(self) -> FieldExtractors:
+        "Functions extracting each offer field from the DOM"
+        return {"company": self.get_company_name, "title": self.get_job_title}
+
+    def extract(self, fields: Optional[Iterable[str]] = None) -> JobOffer:
+        return self.offer_view.to_offer(fields)
+
+    def render(self, offer: JobOffer) -> List[str]:
+        return render_offer(offer)
+
     def parse(self) -> List[str]:
-        pass
+        return self.render(self.extract())
 
 
 class BaseParser(Parser):
-    def __init__(self, text: str, selectors: Selectors) -> None:
-        self._text = text
+    def __init__(self, text: PageSource, selectors: Selectors) -> None:
         self._selectors = selectors
-        self._soup = BeautifulSoup(self._text, features="html.parser")
+        super().__init__(text)
+
+    def get_container_keys(self) -> Optional[FrozenSet["SelectorKey"]]:
+        if not self.strain_document:
+            return None
+        return self._selectors.get_keys(self.container_attributes)
+
+    @property
+    def _soup(self) -> "BeautifulSoup":
+        return self._document.soup
+
+    @cached_property
+    def _index(self) -> "SelectorIndex":
+        return self._document.selector_index(
+            selector.key for selector in self._selectors
+        )
 
     def get_attribute(
-        self, attribute: str, soup: Optional[Union[BeautifulSoup, Tag]] = None
-    ) -> Tag:
-        soup = soup or self._soup
+        self, attribute: str, soup: Optional[Union["BeautifulSoup", "Tag"]] = None
+    ) -> "Tag":
         selector = self._selectors.get_html_tags(attribute)
-        element = soup.find(selector.html, class_=selector.class_)
-        if not isinstance(element, Tag):
+        with span("get_attribute", attribute):
+            element = self._index.find(selector.key, scope=soup)
+        if element is None:
             raise AttributeNotFoundError(
                 f"Attribute not found with parser: {self.__class__.__name__}"
             )
         return element
 
     def get_attributes(
-        self, attribute: str, soup: Optional[Union[BeautifulSoup, Tag]] = None
-    ) -> List[PageElement]:
-        soup = soup or self._soup
+        self, attribute: str, soup: Optional[Union["BeautifulSoup", "Tag"]] = None
+    ) -> List["Tag"]:
         selector = self._selectors.get_html_tags(attribute)
-        element = soup.find_all(selector.html, class_=selector.class_)
-        return element
+        with span("get_attributes", attribute):
+            return self._index.find_all(selector.key, soup)
 
     def get_company_name(self) -> str:
+        if self.embedded_offer is not None:
+            return self.embedded_offer.company
         company_name = self.get_attribute(BaseAttributes.COMPANY_NAME.value).get_text()
         company_name = " ".join(company_name.split())
         return company_name
 
     def get_job_title(self) -> str:
+        if self.embedded_offer is not None:
+            return self.embedded_offer.title
         job_title = self.get_attribute(BaseAttributes.JOB_TITLE.value).get_text()
         job_title = " ".join(job_title.split())
         return job_title
 
-    def parse(self) -> List[str]:
+    def render(self, offer: JobOffer) -> List[str]:
         return ["Parsing will be implemented later..."]
 
 
@@ -9,6 +9,7 @@ from job_offer_parser.parsers.base_parser import (
     Selector,
     Selectors,
 )
+from job_offer_parser.parsers.document import PageSource
 
 
 class BulldogJobAttributes(AutoNameEnum):
@@ -32,11 +33,14 @@ BULLDOGJOB_SELECTORS = Selectors(
 
 class BulldogJobParser(BaseParser, Parser):
     portal_identifier = "bulldogjob"
+    hostnames = ("bulldogjob.pl",)
+    requires_js_rendering = False
+    default_selectors = BULLDOGJOB_SELECTORS
 
     def __init__(
         self,
-        text: str,
+        text: PageSource,
         selectors: Optional[Selectors] = None,
     ) -> None:
-        selectors = selectors or BULLDOGJOB_SELECTORS
+        selectors = selectors or self.default_selectors
         super().__init__(text, selectors)
@@ -0,0 +1,64 @@
+import hashlib
+from functools import cached_property
+from typing import TYPE_CHECKING, Dict, FrozenSet, Iterable, Optional, Union
+
+from job_offer_parser.instrumentation import span
+from job_offer_parser.parsers.backends import build_soup
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+    from job_offer_parser.parsers.selector_index import SelectorIndex, SelectorKey
+
+
+class Document:
+    "Raw page content parsed at most once and shared by every candidate parser"
+
+    def __init__(self, text: str, backend: Optional[str] = None) -> None:
+        self.text = text
+        self._backend = backend
+        self._indexes: Dict[FrozenSet["SelectorKey"], "SelectorIndex"] = {}
+        self._container_keys: FrozenSet["SelectorKey"] = frozenset()
+        self._whole_page = False
+        self._soup_keys: Optional[FrozenSet["SelectorKey"]] = None
+
+    @cached_property
+    def content_hash(self) -> str:
+        return hashlib.sha256(self.text.encode()).hexdigest()
+
+    def restrict_to(self, keys: Optional[Iterable["SelectorKey"]]) -> None:
+        "Build only subtrees matching these (tag, class) keys; None needs everything"
+        if keys is None:
+            self._whole_page = True
+        else:
+            self._container_keys |= frozenset(keys)
+        if "soup" in self.__dict__ and self._soup_keys is not None:
+            if self._whole_page or not self._container_keys <= self._soup_keys:
+                del self.__dict__["soup"]
+                self._indexes.clear()
+
+    @cached_property
+    def soup(self) -> "BeautifulSoup":
+        self._soup_keys = None if self._whole_page else self._container_keys or None
+        with span("build_soup"):
+            return build_soup(self.text, self._backend, self._soup_keys)
+
+    def selector_index(self, keys: Iterable["SelectorKey"]) -> "SelectorIndex":
+        from job_offer_parser.parsers.selector_index import SelectorIndex
+
+        frozen_keys = frozenset(keys)
+        index = self._indexes.get(frozen_keys)
+        if index is None:
+            soup = self.soup
+            with span("build_index"):
+                index = SelectorIndex(soup, frozen_keys)
+            self._indexes[frozen_keys] = index
+        return index
+
+
+PageSource = Union[str, Document]
+
+
+def as_document(page_content: PageSource) -> Document:
+    if isinstance(page_content, Document):
+        return page_content
+    return Document(page_content)
@@ -0,0 +1,198 @@
+import html
+import json
+import re
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from job_offer_parser.parsers.offer import JobOffer, SalaryRange, TechSkill
+
+LD_JSON_PATTERN = re.compile(
+    r"<script\b[^>]*\btype=[\"']?application/ld\+json[\"']?[^>]*>(.*?)</script\s*>",
+    re.IGNORECASE | re.DOTALL,
+)
+NEXT_DATA_PATTERN = re.compile(
+    r"<script\b[^>]*\bid=[\"']?__NEXT_DATA__[\"']?[^>]*>(.*?)</script\s*>",
+    re.IGNORECASE | re.DOTALL,
+)
+BLOCK_END_PATTERN = re.compile(r"<br\s*/?>|</(?:p|li|div|h\d)\s*>", re.IGNORECASE)
+TAG_PATTERN = re.compile(r"<[^>]+>")
+BLANK_LINES_PATTERN = re.compile(r"\n\s*\n+")
+EMBEDDED_DATA_VERSION = 1
+JOB_POSTING_TYPE = "JobPosting"
+REMOTE_LOCATION = "Remote"
+
+
+def _load_json(content: str) -> Any:
+    try:
+        return json.loads(content)
+    except ValueError:
+        return None
+
+
+def iter_json_ld(text: str) -> Iterator[Any]:
+    for match in LD_JSON_PATTERN.finditer(text):
+        data = _load_json(match.group(1))
+        if data is not None:
+            yield data
+
+
+def _walk_json_ld(data: Any) -> Iterator[Dict[str, Any]]:
+    if isinstance(data, list):
+        for item in data:
+            yield from _walk_json_ld(item)
+    elif isinstance(data, dict):
+        yield data
+        yield from _walk_json_ld(data.get("@graph"))
+
+
+def find_job_posting(text: str) -> Optional[Dict[str, Any]]:
+    for data in iter_json_ld(text):
+        for item in _walk_json_ld(data):
+            types = item.get("@type")
+            if types == JOB_POSTING_TYPE or (
+                isinstance(types, list) and JOB_POSTING_TYPE in types
+            ):
+                return item
+    return None
+
+
+def find_object(data: Any, keys: Sequence[str]) -> Optional[Dict[str, Any]]:
+    "Find the first nested dict that has all of the given keys, breadth first"
+    pending = deque([data])
+    while pending:
+        item = pending.popleft()
+        if isinstance(item, dict):
+            if all(key in item for key in keys):
+                return item
+            pending.extend(item.values())
+        elif isinstance(item, list):
+            pending.extend(item)
+    return None
+
+
+def find_next_data(text: str, keys: Sequence[str]) -> Optional[Dict[str, Any]]:
+    match = NEXT_DATA_PATTERN.search(text)
+    if match is None:
+        return None
+    return find_object(_load_json(match.group(1)), keys)
+
+
+def strip_html(content: str) -> str:
+    content = BLOCK_END_PATTERN.sub("\n", content)
+    content = html.unescape(TAG_PATTERN.sub("", content))
+    return BLANK_LINES_PATTERN.sub("\n\n", content).strip()
+
+
+def to_amount(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _format_amount(amount: float) -> str:
+    return f"{amount:,.0f}".replace(",", " ")
+
+
+def make_salary_range(
+    minimum: Optional[float],
+    maximum: Optional[float],
+    currency: str = "",
+    suffix: str = "",
+) -> SalaryRange:
+    amounts = " - ".join(
+        _format_amount(amount) for amount in (minimum, maximum) if amount is not None
+    )
+    text = " ".join(part for part in (amounts, currency.upper(), suffix) if part)
+    return SalaryRange(text, minimum, maximum if maximum else minimum, currency.upper())
+
+
+def _as_list(value: Any) -> List[Any]:
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def as_text(value: Any) -> str:
+    "The value if it is a string (or a number), otherwise an empty string"
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    return ""
+
+
+def as_dicts(value: Any) -> List[Dict[str, Any]]:
+    return [item for item in _as_list(value) if isinstance(item, dict)]
+
+
+def _get_address(location: Any) -> str:
+    "Text of a Place, PostalAddress or plain text location"
+    address = location.get("address") if isinstance(location, dict) else location
+    if not isinstance(address, dict):
+        return as_text(address)
+    parts = (as_text(address.get(key)) for key in ("addressLocality", "streetAddress"))
+    return ", ".join(part for part in parts if part)
+
+
+def _get_locations(posting: Dict[str, Any]) -> List[str]:
+    locations = [
+        address
+        for address in map(_get_address, _as_list(posting.get("jobLocation")))
+        if address
+    ]
+    if posting.get("jobLocationType") == "TELECOMMUTE":
+        locations.append(REMOTE_LOCATION)
+    return locations
+
+
+def _get_salaries(posting: Dict[str, Any]) -> List[SalaryRange]:
+    salaries = []
+    for salary in as_dicts(posting.get("baseSalary")):
+        value = salary.get("value", {})
+        if not isinstance(value, dict):
+            value = {"value": value}
+        minimum = to_amount(value.get("minValue", value.get("value")))
+        maximum = to_amount(value.get("maxValue")) or minimum
+        unit = as_text(value.get("unitText")).lower()
+        currency = as_text(salary.get("currency"))
+        salaries.append(
+            make_salary_range(minimum, maximum, currency, unit and f"/{unit}")
+        )
+    return salaries
+
+
+def _get_skills(posting: Dict[str, Any]) -> List[TechSkill]:
+    skills = posting.get("skills")
+    if isinstance(skills, str):
+        skills = skills.split(",")
+    names = (
+        as_text(skill.get("name") if isinstance(skill, dict) else skill)
+        for skill in _as_list(skills)
+    )
+    return [TechSkill(name) for name in names if name]
+
+
+def job_posting_to_offer(posting: Dict[str, Any]) -> Optional[JobOffer]:
+    "Map a schema.org JobPosting to an offer, if it names the company and title"
+    organization = posting.get("hiringOrganization")
+    if not isinstance(organization, dict):
+        organization = {"name": organization}
+    company, title = as_text(organization.get("name")), as_text(posting.get("title"))
+    if not company or not title:
+        return None
+    employment_types = [
+        text for text in map(as_text, _as_list(posting.get("employmentType"))) if text
+    ]
+    details = {"Employment Type": ", ".join(employment_types)}
+    urls = (as_text(organization.get(key)) for key in ("sameAs", "url"))
+    return JobOffer(
+        company=company,
+        title=title,
+        company_url=next((url for url in urls if url), ""),
+        locations=_get_locations(posting),
+        salaries=_get_salaries(posting),
+        details=details if employment_types else {},
+        tech_stack=_get_skills(posting),
+        description=strip_html(as_text(posting.get("description"))),
+    )
@@ -9,6 +9,7 @@ from job_offer_parser.parsers.base_parser import (
     Selector,
     Selectors,
 )
+from job_offer_parser.parsers.document import PageSource
 
 
 class InhireAttributes(AutoNameEnum):
@@ -29,11 +30,13 @@ INHIRE_SELECTORS = Selectors(
 
 class InhireParser(BaseParser, Parser):
     portal_identifier = "inhire"
+    hostnames = ("inhire.io",)
+    default_selectors = INHIRE_SELECTORS
 
     def __init__(
         self,
-        text: str,
+        text: PageSource,
         selectors: Optional[Selectors] = None,
     ) -> None:
-        selectors = selectors or INHIRE_SELECTORS
+        selectors = selectors or self.default_selectors
         super().__init__(text, selectors)
@@ -1,7 +1,8 @@
 from enum import auto
-from typing import List, Optional
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
-from bs4 import Tag
+from job_offer_parser.instrumentation import timed
 from job_offer_parser.module_exceptions import AttributeNotFoundError
 from job_offer_parser.parsers.base_parser import (
     AutoNameEnum,
@@ -11,6 +12,26 @@ from job_offer_parser.parsers.base_parser import (
     Selector,
     Selectors,
 )
+from job_offer_parser.parsers.document import PageSource
+from job_offer_parser.parsers.embedded import (
+    REMOTE_LOCATION,
+    as_dicts,
+    as_text,
+    make_salary_range,
+    strip_html,
+    to_amount,
+)
+from job_offer_parser.parsers.offer import (
+    FieldExtractors,
+    JobOffer,
+    SalaryRange,
+    TechSkill,
+    parse_salary,
+    render_offer,
+)
+
+if TYPE_CHECKING:
+    from bs4 import Tag
 
 
 class JustJoinItAttributes(AutoNameEnum):
@@ -64,41 +85,98 @@ JUST_JOIN_IT_SELECTORS = Selectors(
 
 class JustJoinITParser(BaseParser, Parser):
     portal_identifier = "justjoin"
+    hostnames = ("justjoin.it",)
+    default_selectors = JUST_JOIN_IT_SELECTORS
+    next_data_keys = ("title", "companyName")
+    container_attributes: Tuple[str, ...] = (
+        JustJoinItAttributes.COMPANY_NAME.value,
+        JustJoinItAttributes.JOB_TITLE.value,
+        JustJoinItAttributes.SUMMARY.value,
+        JustJoinItAttributes.LOCATION.value,
+        JustJoinItAttributes.SALARY.value,
+        JustJoinItAttributes.COMPANY_DETAILS.value,
+        JustJoinItAttributes.TECH_STACK.value,
+        JustJoinItAttributes.DESCRIPTION.value,
+    )
 
-    def __init__(self, text: str, selectors: Optional[Selectors] = None) -> None:
-        _selectors = selectors or JUST_JOIN_IT_SELECTORS
+    def __init__(self, text: PageSource, selectors: Optional[Selectors] = None) -> None:
+        _selectors = selectors or self.default_selectors
         super().__init__(text, _selectors)
 
-    def parse(self) -> List[str]:
-        parsed_job_offer = [
-            self._get_heading(),
-            self._get_location(),
-            self._get_salary(),
-            self._get_team_details(),
-            self._get_tech_stack(),
-            self._get_description(),
-        ]
-        return parsed_job_offer
-
-    def _get_heading(self) -> str:
-        job_title = self.get_attribute(JustJoinItAttributes.JOB_TITLE.value)
+    def get_field_extractors(self) -> FieldExtractors:
+        return {
+            "company": lambda: self._company.get_text(),
+            "title": lambda: self.get_attribute(
+                JustJoinItAttributes.JOB_TITLE.value
+            ).get_text(),
+            "company_url": lambda: str(self._company.get("href", "")),
+            "locations": self._get_location,
+            "salaries": self._get_salary,
+            "details": self._get_team_details,
+            "tech_stack": self._get_tech_stack,
+            "description": self._get_description,
+        }
+
+    @cached_property
+    def _company(self) -> "Tag":
+        return self._get_company()
+
+    def render(self, offer: JobOffer) -> List[str]:
+        return render_offer(offer)
+
+    def offer_from_next_data(self, data: Dict[str, Any]) -> Optional[JobOffer]:
+        company, title = as_text(data["companyName"]), as_text(data["title"])
+        if not company or not title:
+            return None
+        details = {
+            "Company Size": as_text(data.get("companySize")),
+            "Level": as_text(data.get("experienceLevel")),
+        }
+        return JobOffer(
+            company=company,
+            title=title,
+            company_url=as_text(data.get("companyUrl")),
+            locations=self._get_next_data_locations(data),
+            salaries=[
+                make_salary_range(
+                    to_amount(employment.get("from")),
+                    to_amount(employment.get("to")),
+                    as_text(employment.get("currency")),
+                    as_text(employment.get("type")),
+                )
+                for employment in as_dicts(data.get("employmentTypes"))
+                if employment.get("from") or employment.get("to")
+            ],
+            details={key: value for key, value in details.items() if value},
+            tech_stack=[
+                TechSkill(as_text(skill.get("name")), as_text(skill.get("level")))
+                for skill in as_dicts(data.get("requiredSkills"))
+                if as_text(skill.get("name"))
+            ],
+            description=strip_html(as_text(data.get("body"))),
+        )
+
+    @staticmethod
+    def _get_next_data_locations(data: Dict[str, Any]) -> List[str]:
+        places = (
+            (as_text(place.get("city")), as_text(place.get("street")))
+            for place in as_dicts(data.get("multilocation")) or [data]
+        )
+        locations = [", ".join(part for part in place if part) for place in places]
+        locations = [location for location in locations if location]
+        if data.get("workplaceType") == "remote" or data.get("remote") is True:
+            locations.append(REMOTE_LOCATION)
+        return locations
+
+    @timed("extractor")
+    def _get_company(self) -> "Tag":
         summary_soup = self.get_attribute(JustJoinItAttributes.SUMMARY.value)
-        company_name = self.get_attribute(
+        return self.get_attribute(
             JustJoinItAttributes.COMPANY_NAME.value, soup=summary_soup
         )
-        company_and_job_title = f"{company_name.get_text()} - {job_title.get_text()}"
-        emphasis = "-" * len(company_and_job_title)
-        heading_result = "\n".join(
-            [
-                emphasis,
-                company_and_job_title,
-                emphasis,
-                str(company_name.get("href", "")),
-            ]
-        )
-        return heading_result
 
-    def _get_location(self) -> str:
+    @timed("extractor")
+    def _get_location(self) -> List[str]:
         location_soup = self.get_attribute(JustJoinItAttributes.LOCATION.value)
         company_location = self.get_attribute(
             JustJoinItAttributes.LOCATION_COMPANY.value, soup=location_soup
@@ -111,41 +189,39 @@ class JustJoinITParser(BaseParser, Parser):
             location.append(working_location.get_text())
         except AttributeNotFoundError:
             pass
-        location_result = "\n".join(location)
-        return location_result
+        return location
 
-    def _get_salary(self) -> str:
+    @timed("extractor")
+    def _get_salary(self) -> List[SalaryRange]:
         salary_soups = self.get_attributes(JustJoinItAttributes.SALARY.value)
-        salary = [salary_soup.get_text() for salary_soup in salary_soups]
-        salary_result = "\n".join(salary)
-        return salary_result
+        return [parse_salary(salary_soup.get_text()) for salary_soup in salary_soups]
 
-    def _get_team_details(self) -> str:
+    @timed("extractor")
+    def _get_team_details(self) -> Dict[str, str]:
         company_details = self.get_attributes(
             JustJoinItAttributes.COMPANY_DETAILS.value
         )
-        details = []
-        for desc, item in zip(["Company Size:", "Level:"], company_details):
-            details.append(f"{desc} {item.get_text().strip()}")
-        details_result = "\n".join(details)
-        return details_result
+        details = {}
+        for desc, item in zip(["Company Size", "Level"], company_details):
+            details[desc] = item.get_text().strip()
+        return details
 
-    def _get_tech_stack(self) -> str:
+    @timed("extractor")
+    def _get_tech_stack(self) -> List[TechSkill]:
         tech_stack_soup = self.get_attribute(JustJoinItAttributes.TECH_STACK.value)
         stack_soups = self.get_attributes(
             JustJoinItAttributes.STACKS.value, soup=tech_stack_soup
         )
         tech_stacks = []
         for stack_soup in stack_soups:
-            assert isinstance(stack_soup, Tag)
             tech = self.get_attribute(JustJoinItAttributes.TECH.value, soup=stack_soup)
             level = self.get_attribute(
                 JustJoinItAttributes.LEVEL.value, soup=stack_soup
             )
-            tech_stacks.append(f"{tech.get_text()}: {level.get_text()}")
-        tech_stacks_result = "\n".join(tech_stacks)
-        return tech_stacks_result
+            tech_stacks.append(TechSkill(tech.get_text(), level.get_text()))
+        return tech_stacks
 
+    @timed("extractor")
     def _get_description(self) -> str:
         details = self.get_attribute(JustJoinItAttributes.DESCRIPTION.value)
         return details.get_text()
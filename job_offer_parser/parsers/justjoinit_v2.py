@@ -1,6 +1,7 @@
 from enum import auto
-from typing import Optional
+from typing import Dict, Optional
 
+from job_offer_parser.instrumentation import timed
 from job_offer_parser.parsers.base_parser import (
     AutoNameEnum,
     HTMLTag,
@@ -8,6 +9,7 @@ from job_offer_parser.parsers.base_parser import (
     Selector,
     Selectors,
 )
+from job_offer_parser.parsers.document import PageSource
 from job_offer_parser.parsers.justjoinit import JustJoinITParser
 
 
@@ -73,20 +75,33 @@ JUST_JOIN_IT_SELECTORS_V2 = Selectors(
 
 class JustJoinITParserV2(JustJoinITParser, Parser):
     portal_identifier = "justjoin"
+    parser_version = 2
+    default_selectors = JUST_JOIN_IT_SELECTORS_V2
+    container_attributes = (
+        JustJoinItAttributesV2.COMPANY_NAME.value,
+        JustJoinItAttributesV2.JOB_TITLE.value,
+        JustJoinItAttributesV2.SUMMARY.value,
+        JustJoinItAttributesV2.LOCATION.value,
+        JustJoinItAttributesV2.SALARY.value,
+        JustJoinItAttributesV2.COMPANY_DETAIL.value,
+        JustJoinItAttributesV2.COMPANY_DETAIL_VALUE.value,
+        JustJoinItAttributesV2.TECH_STACK.value,
+        JustJoinItAttributesV2.DESCRIPTION.value,
+    )
 
-    def __init__(self, text: str, selectors: Optional[Selectors] = None) -> None:
-        _selectors = selectors or JUST_JOIN_IT_SELECTORS_V2
+    def __init__(self, text: PageSource, selectors: Optional[Selectors] = None) -> None:
+        _selectors = selectors or self.default_selectors
         super().__init__(text, _selectors)
 
-    def _get_team_details(self) -> str:
+    @timed("extractor")
+    def _get_team_details(self) -> Dict[str, str]:
         company_details = self.get_attributes(
             JustJoinItAttributesV2.COMPANY_DETAIL.value
         )
         company_details_values = self.get_attributes(
             JustJoinItAttributesV2.COMPANY_DETAIL_VALUE.value
         )
-        details = []
+        details = {}
         for key, value in zip(company_details, company_details_values):
-            details.append(f"{key.get_text().strip()}: {value.get_text().strip()}")
-        details_result = "\n".join(details)
-        return details_result
+            details[key.get_text().strip()] = value.get_text().strip()
+        return details
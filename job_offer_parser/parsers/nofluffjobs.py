@@ -9,6 +9,7 @@ from job_offer_parser.parsers.base_parser import (
     Selector,
     Selectors,
 )
+from job_offer_parser.parsers.document import PageSource
 
 
 class NoFluffJobsAttributes(AutoNameEnum):
@@ -32,11 +33,13 @@ NOFLUFFJOBS_SELECTORS = Selectors(
 
 class NoFluffJobsParser(BaseParser, Parser):
     portal_identifier = "nofluffjobs"
+    hostnames = ("nofluffjobs.com",)
+    default_selectors = NOFLUFFJOBS_SELECTORS
 
     def __init__(
         self,
-        text: str,
+        text: PageSource,
         selectors: Optional[Selectors] = None,
     ) -> None:
-        selectors = selectors or NOFLUFFJOBS_SELECTORS
+        selectors = selectors or self.default_selectors
         super().__init__(text, selectors)
@@ -0,0 +1,126 @@
+import re
+from dataclasses import asdict, dataclass, field, fields
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# Part of every parser fingerprint: bump it whenever JobOffer or the shared
+# extraction changes, so that cached results and manifests are not reused
+EXTRACTION_VERSION = 2
+# Thousands are grouped by a single (narrow) space, never by a newline
+SALARY_AMOUNT_PATTERN = re.compile(
+    r"(?<!\w)(?:\d{1,3}(?:[ \u00a0\u202f]\d{3}(?!\d))+|\d+)(?:[.,]\d+)?(?:[kK]\b)?"
+)
+SALARY_CURRENCY_PATTERN = re.compile(r"\b(PLN|EUR|USD|GBP|CHF|zł)(?!\w)", re.IGNORECASE)
+CURRENCY_ALIASES = {"ZŁ": "PLN"}
+
+
+@dataclass(slots=True)
+class SalaryRange:
+    text: str
+    minimum: Optional[float] = None
+    maximum: Optional[float] = None
+    currency: str = ""
+
+
+@dataclass(slots=True)
+class TechSkill:
+    name: str
+    level: str = ""
+
+
+@dataclass(slots=True)
+class JobOffer:
+    company: str
+    title: str
+    company_url: str = ""
+    locations: List[str] = field(default_factory=list)
+    salaries: List[SalaryRange] = field(default_factory=list)
+    details: Dict[str, str] = field(default_factory=dict)
+    tech_stack: List[TechSkill] = field(default_factory=list)
+    description: str = ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, content: Dict[str, Any]) -> "JobOffer":
+        return cls(
+            **{
+                **content,
+                "salaries": [SalaryRange(**item) for item in content["salaries"]],
+                "tech_stack": [TechSkill(**item) for item in content["tech_stack"]],
+            }
+        )
+
+
+OFFER_FIELDS = tuple(item.name for item in fields(JobOffer))
+FieldExtractors = Dict[str, Callable[[], Any]]
+
+
+class LazyOffer:
+    "Offer fields extracted on first access and memoized"
+
+    def __init__(self, extractors: FieldExtractors) -> None:
+        self._extractors = extractors
+        self._values: Dict[str, Any] = {}
+
+    def get(self, name: str) -> Any:
+        if name not in self._values:
+            extractor = self._extractors.get(name)
+            if extractor is None:
+                return getattr(JobOffer(company="", title=""), name)
+            self._values[name] = extractor()
+        return self._values[name]
+
+    def __getattr__(self, name: str) -> Any:
+        if name not in OFFER_FIELDS:
+            raise AttributeError(f"{self.__class__.__name__} has no field {name!r}")
+        return self.get(name)
+
+    def to_offer(self, names: Optional[Iterable[str]] = None) -> JobOffer:
+        "Offer with the given fields (all by default) extracted, the rest empty"
+        names = OFFER_FIELDS if names is None else tuple(names)
+        unknown = set(names) - set(OFFER_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown offer fields: {', '.join(sorted(unknown))}")
+        values = {name: self.get(name) for name in names}
+        return JobOffer(**{"company": "", "title": "", **values})
+
+
+def _parse_amount(amount: str) -> float:
+    amount = amount.strip()
+    multiplier = 1000 if amount[-1] in "kK" else 1
+    amount = re.sub(r"[\skK]", "", amount).replace(",", ".")
+    return float(amount) * multiplier
+
+
+def _normalize_currency(currency: str) -> str:
+    currency = currency.upper()
+    return CURRENCY_ALIASES.get(currency, currency)
+
+
+def parse_salary(text: str) -> SalaryRange:
+    amounts = [_parse_amount(amount) for amount in SALARY_AMOUNT_PATTERN.findall(text)]
+    currency = SALARY_CURRENCY_PATTERN.search(text)
+    return SalaryRange(
+        text=text,
+        minimum=amounts[0] if amounts else None,
+        maximum=amounts[1] if len(amounts) > 1 else (amounts[0] if amounts else None),
+        currency=_normalize_currency(currency.group(1)) if currency else "",
+    )
+
+
+def render_heading(offer: JobOffer) -> str:
+    company_and_job_title = f"{offer.company} - {offer.title}"
+    emphasis = "-" * len(company_and_job_title)
+    return "\n".join([emphasis, company_and_job_title, emphasis, offer.company_url])
+
+
+def render_offer(offer: JobOffer) -> List[str]:
+    return [
+        render_heading(offer),
+        "\n".join(offer.locations),
+        "\n".join(salary.text for salary in offer.salaries),
+        "\n".join(f"{key}: {value}" for key, value in offer.details.items()),
+        "\n".join(f"{skill.name}: {skill.level}" for skill in offer.tech_stack),
+        offer.description,
+    ]
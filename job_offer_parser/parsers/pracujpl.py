@@ -9,6 +9,7 @@ from job_offer_parser.parsers.base_parser import (
     Selector,
     Selectors,
 )
+from job_offer_parser.parsers.document import PageSource
 
 
 class PracujPLAttributes(AutoNameEnum):
@@ -31,11 +32,14 @@ PRACUJPL_SELECTORS = Selectors(
 
 class PracujPLParser(BaseParser, Parser):
     portal_identifier = "pracuj.pl"
+    hostnames = ("pracuj.pl",)
+    requires_js_rendering = False
+    default_selectors = PRACUJPL_SELECTORS
 
     def __init__(
         self,
-        text: str,
+        text: PageSource,
         selectors: Optional[Selectors] = None,
     ) -> None:
-        selectors = selectors or PRACUJPL_SELECTORS
+        selectors = selectors or self.default_selectors
         super().__init__(text, selectors)
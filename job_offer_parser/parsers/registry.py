@@ -0,0 +1,107 @@
+import importlib
+import warnings
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Type
+
+if TYPE_CHECKING:
+    from job_offer_parser.parsers.base_parser import Parser
+
+ENTRY_POINT_GROUP = "job_offer_parser.parsers"
+PARSER_MODULES: Dict[str, Tuple[str, ...]] = {
+    "justjoin.it": (
+        "job_offer_parser.parsers.justjoinit",
+        "job_offer_parser.parsers.justjoinit_v2",
+    ),
+    "nofluffjobs.com": ("job_offer_parser.parsers.nofluffjobs",),
+    "pracuj.pl": ("job_offer_parser.parsers.pracujpl",),
+    "bulldogjob.pl": ("job_offer_parser.parsers.bulldogjob",),
+    "theprotocol.it": ("job_offer_parser.parsers.theprotocol",),
+    "solid.jobs": ("job_offer_parser.parsers.solidjobs",),
+    "inhire.io": ("job_offer_parser.parsers.inhire",),
+}
+
+
+def normalize_hostname(hostname: str) -> str:
+    return hostname.strip().lower().rstrip(".")
+
+
+def _parser_order(parser_cls: Type["Parser"]) -> Tuple[int, int]:
+    return -parser_cls.parser_priority, -parser_cls.parser_version
+
+
+class ParserRegistry:
+    "Parsers by hostname; built-in parser modules are imported on first lookup"
+
+    def __init__(
+        self,
+        entry_point_group: str = ENTRY_POINT_GROUP,
+        parser_modules: Optional[Dict[str, Tuple[str, ...]]] = None,
+    ) -> None:
+        self._entry_point_group = entry_point_group
+        self._entry_points_loaded = False
+        self._parser_modules = (
+            PARSER_MODULES if parser_modules is None else parser_modules
+        )
+        self._parsers: List[Type["Parser"]] = []
+        self._by_hostname: Dict[str, List[Type["Parser"]]] = {}
+
+    def register(self, parser_cls: Type["Parser"]) -> Type["Parser"]:
+        if parser_cls in self._parsers:
+            return parser_cls
+        self._parsers.append(parser_cls)
+        self._parsers.sort(key=_parser_order)
+        for hostname in parser_cls.hostnames:
+            candidates = self._by_hostname.setdefault(normalize_hostname(hostname), [])
+            candidates.append(parser_cls)
+            candidates.sort(key=_parser_order)
+        return parser_cls
+
+    def load_entry_points(self) -> None:
+        if self._entry_points_loaded:
+            return
+        self._entry_points_loaded = True
+        from importlib.metadata import entry_points
+
+        for entry_point in entry_points(group=self._entry_point_group):
+            try:
+                loaded = entry_point.load()
+            except Exception as e:
+                warnings.warn(f"Cannot load parser plugin {entry_point.name}: {e}")
+                continue
+            if isinstance(loaded, type):
+                self.register(loaded)
+
+    def load_modules(self, hostname: Optional[str] = None) -> None:
+        "Import the parser modules for a hostname, or all of them"
+        if hostname is None:
+            modules = [
+                module for group in self._parser_modules.values() for module in group
+            ]
+        else:
+            modules = list(self._parser_modules.get(hostname, ()))
+        for module in modules:
+            importlib.import_module(module)
+
+    def get_parsers(self, portal: str) -> List[Type["Parser"]]:
+        self.load_entry_points()
+        labels = normalize_hostname(portal).split(".")
+        for start in range(max(len(labels) - 1, 1)):
+            hostname = ".".join(labels[start:])
+            self.load_modules(hostname)
+            candidates = self._by_hostname.get(hostname)
+            if candidates:
+                return list(candidates)
+        self.load_modules()
+        return [
+            parser_cls
+            for parser_cls in self._parsers
+            if parser_cls.meets_condition(portal)
+        ]
+
+    @property
+    def parsers(self) -> List[Type["Parser"]]:
+        self.load_entry_points()
+        self.load_modules()
+        return list(self._parsers)
+
+
+REGISTRY = ParserRegistry()
@@ -0,0 +1,86 @@
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from bs4 import BeautifulSoup, Tag
+
+SelectorKey = Tuple[str, str]
+
+
+class SelectorIndex:
+    "Answer (tag, class) lookups from a single walk over the document"
+
+    def __init__(
+        self, root: Union[BeautifulSoup, Tag], keys: Iterable[SelectorKey]
+    ) -> None:
+        self._root = root
+        self._buckets: Dict[SelectorKey, List[Tag]] = {key: [] for key in keys}
+        self._positions: Dict[SelectorKey, List[int]] = {
+            key: [] for key in self._buckets
+        }
+        self._element_positions: Dict[int, int] = {}
+        self._subtree_ends: Dict[int, int] = {}
+        self._build()
+
+    def _build(self) -> None:
+        position = 0
+        for element in self._root.descendants:
+            if not isinstance(element, Tag):
+                continue
+            self._element_positions[id(element)] = position
+            for class_ in self._get_classes(element):
+                key = (element.name, class_)
+                bucket = self._buckets.get(key)
+                if bucket is not None:
+                    bucket.append(element)
+                    self._positions[key].append(position)
+            position += 1
+
+    @staticmethod
+    def _get_classes(element: Tag) -> Iterable[str]:
+        classes = element.get("class")
+        if not classes:
+            return ()
+        if isinstance(classes, str):
+            classes = classes.split()
+        return {*classes, " ".join(classes)}
+
+    def _subtree_end(self, element: Tag, start: int) -> int:
+        end = self._subtree_ends.get(id(element))
+        if end is not None:
+            return end
+        end, last = start, element
+        while True:
+            children = [child for child in last.contents if isinstance(child, Tag)]
+            if not children:
+                break
+            last = children[-1]
+            end = self._element_positions[id(last)]
+        self._subtree_ends[id(element)] = end
+        return end
+
+    def find_all(
+        self, key: SelectorKey, scope: Optional[Union[BeautifulSoup, Tag]] = None
+    ) -> List[Tag]:
+        bucket = self._buckets.get(key)
+        if bucket is not None:
+            if scope is None or scope is self._root:
+                return list(bucket)
+            start = self._element_positions.get(id(scope))
+            if start is not None:
+                positions = self._positions[key]
+                first = bisect_right(positions, start)
+                last = bisect_right(positions, self._subtree_end(scope, start))
+                return bucket[first:last]
+        html, class_ = key
+        scope = self._root if scope is None else scope
+        return [
+            element
+            for element in scope.find_all(html, class_=class_)
+            if isinstance(element, Tag)
+        ]
+
+    def find(
+        self, key: SelectorKey, scope: Optional[Union[BeautifulSoup, Tag]] = None
+    ) -> Optional[Tag]:
+        elements = self.find_all(key, scope)
+        return elements[0] if elements else None
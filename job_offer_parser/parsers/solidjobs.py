@@ -9,6 +9,7 @@ from job_offer_parser.parsers.base_parser import (
     Selector,
     Selectors,
 )
+from job_offer_parser.parsers.document import PageSource
 
 
 class SolidJobsAttributes(AutoNameEnum):
@@ -28,11 +29,14 @@ SOLIDJOBS_SELECTORS = Selectors(
 
 class SolidJobsParser(BaseParser, Parser):
     portal_identifier = "solid.jobs"
+    hostnames = ("solid.jobs",)
+    requires_js_rendering = False
+    default_selectors = SOLIDJOBS_SELECTORS
 
     def __init__(
         self,
-        text: str,
+        text: PageSource,
         selectors: Optional[Selectors] = None,
     ) -> None:
-        selectors = selectors or SOLIDJOBS_SELECTORS
+        selectors = selectors or self.default_selectors
         super().__init__(text, selectors)
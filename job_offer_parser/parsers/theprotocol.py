@@ -9,6 +9,7 @@ from job_offer_parser.parsers.base_parser import (
     Selector,
     Selectors,
 )
+from job_offer_parser.parsers.document import PageSource
 
 
 class TheProtocolAttributes(AutoNameEnum):
@@ -31,11 +32,14 @@ THEPROTOCOL_SELECTORS = Selectors(
 
 class TheProtocolParser(BaseParser, Parser):
     portal_identifier = "theprotocol"
+    hostnames = ("theprotocol.it",)
+    requires_js_rendering = False
+    default_selectors = THEPROTOCOL_SELECTORS
 
     def __init__(
         self,
-        text: str,
+        text: PageSource,
         selectors: Optional[Selectors] = None,
     ) -> None:
-        selectors = selectors or THEPROTOCOL_SELECTORS
+        selectors = selectors or self.default_selectors
         super().__init__(text, selectors)
@@ -0,0 +1,158 @@
+import asyncio
+import json
+import os
+from concurrent.futures import Executor
+from dataclasses import asdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from job_offer_parser.batch import create_executor
+from job_offer_parser.dedupe import (
+    close_dedupe_index,
+    find_duplicate,
+    should_skip_duplicates,
+)
+from job_offer_parser.parser_stats import get_parser_stats
+from job_offer_parser.parsers.document import Document
+from job_offer_parser.parsers.offer import JobOffer
+from job_offer_parser.scheduler import CrawlResult, CrawlScheduler
+from job_offer_parser.settings import CRAWL_QUEUE_SIZE
+from job_offer_parser.sources import (
+    STATUS_ERROR,
+    STATUS_PARSED,
+    ParsedPage,
+    SourceStatus,
+    parse_downloaded,
+    save_page,
+)
+from job_offer_parser.utils import generate_fallback_filename
+
+ParsedResult = Tuple[CrawlResult, ParsedPage]
+
+
+def parse_crawl_result(url: str, page_content: str) -> ParsedPage:
+    try:
+        return parse_downloaded(url, page_content)
+    except Exception as e:
+        status = SourceStatus(url, STATUS_ERROR, error=f"{e.__class__.__name__}: {e}")
+        return ParsedPage(status, generate_fallback_filename(url))
+
+
+def get_status_record(status: SourceStatus, result: CrawlResult) -> Dict[str, Any]:
+    return {
+        **asdict(status),
+        "attempts": result.attempts,
+        "elapsed": round(result.elapsed, 3),
+        "from_cache": result.from_cache,
+    }
+
+
+def print_status(status: SourceStatus, result: CrawlResult) -> None:
+    print(json.dumps(get_status_record(status, result), ensure_ascii=False), flush=True)
+
+
+def record_parser_stats(page: ParsedPage) -> None:
+    parser_stats = get_parser_stats()
+    for parser_name in page.failed_parsers:
+        parser_stats.record(page.status.portal, parser_name, success=False)
+    if page.status.parser:
+        parser_stats.record(page.status.portal, page.status.parser, success=True)
+
+
+def check_duplicate(page: ParsedPage) -> bool:
+    "Flag an offer seen before under another source; True if it should not be saved"
+    status = page.status
+    if status.offer is not None:
+        offer = JobOffer.from_dict(status.offer)
+        status.duplicate_of = find_duplicate(status.source, offer)
+    return bool(status.duplicate_of) and should_skip_duplicates()
+
+
+class Pipeline:
+    "Fetch, parse and save stages running concurrently with bounded queues"
+
+    def __init__(
+        self,
+        scheduler: CrawlScheduler,
+        executor: Executor,
+        parse_tasks: int,
+        queue_size: int = CRAWL_QUEUE_SIZE,
+    ) -> None:
+        self._scheduler = scheduler
+        self._executor = executor
+        self._parse_tasks = parse_tasks
+        self._parse_queue: "asyncio.Queue[Optional[CrawlResult]]" = asyncio.Queue(
+            queue_size
+        )
+        self._save_queue: "asyncio.Queue[Optional[ParsedResult]]" = asyncio.Queue(
+            queue_size
+        )
+        self.exit_code = 0
+
+    async def run(self, urls: Iterable[str]) -> int:
+        await asyncio.gather(
+            self._fetch_stage(urls),
+            *(self._parse_stage() for _ in range(self._parse_tasks)),
+            self._save_stage(),
+        )
+        return self.exit_code
+
+    async def _fetch_stage(self, urls: Iterable[str]) -> None:
+        async for result in self._scheduler.crawl(urls):
+            await self._parse_queue.put(result)
+        for _ in range(self._parse_tasks):
+            await self._parse_queue.put(None)
+
+    async def _parse_stage(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            result = await self._parse_queue.get()
+            if result is None:
+                await self._save_queue.put(None)
+                return
+            if result.page_content is None:
+                status = SourceStatus(result.url, STATUS_ERROR, result.portal)
+                status.error = result.error
+                page = ParsedPage(status)
+            else:
+                page = await loop.run_in_executor(
+                    self._executor, parse_crawl_result, result.url, result.page_content
+                )
+            await self._save_queue.put((result, page))
+
+    async def _save_stage(self) -> None:
+        running = self._parse_tasks
+        while running:
+            item = await self._save_queue.get()
+            if item is None:
+                running -= 1
+                continue
+            result, page = item
+            status = page.status
+            skip = check_duplicate(page)
+            if result.page_content is not None and page.filename and not skip:
+                document = Document(result.page_content)
+                status.saved_as = await asyncio.to_thread(
+                    save_page, document, result.url, page.filename
+                )
+            record_parser_stats(page)
+            print_status(status, result)
+            if status.status != STATUS_PARSED:
+                self.exit_code = 1
+
+
+async def crawl(
+    urls: List[str],
+    workers: Optional[int] = None,
+    queue_size: int = CRAWL_QUEUE_SIZE,
+    **scheduler_options: Any,
+) -> int:
+    parse_tasks = workers or os.cpu_count() or 1
+    with create_executor(parse_tasks) as executor:
+        async with CrawlScheduler(
+            queue_size=queue_size, **scheduler_options
+        ) as scheduler:
+            pipeline = Pipeline(scheduler, executor, parse_tasks, queue_size)
+            exit_code = await pipeline.run(urls)
+    get_parser_stats().save()
+    close_dedupe_index()
+    return exit_code
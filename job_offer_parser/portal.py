@@ -0,0 +1,82 @@
+import urllib.parse
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+
+from job_offer_parser.instrumentation import timed
+from job_offer_parser.parsers.document import Document, PageSource
+
+HEAD_SCAN_LIMIT = 64 * 1024
+SCAN_CHUNK_SIZE = 4 * 1024
+
+PORTAL_FINGERPRINTS: Dict[str, Tuple[str, ...]] = {
+    "justjoin.it": ("justjoin.it",),
+    "nofluffjobs.com": ("nofluffjobs.com",),
+    "www.pracuj.pl": ("pracuj.pl",),
+    "bulldogjob.pl": ("bulldogjob.pl",),
+    "theprotocol.it": ("theprotocol.it",),
+    "solid.jobs": ("solid.jobs",),
+    "inhire.io": ("inhire.io",),
+}
+
+
+class _StopScan(Exception):
+    pass
+
+
+class HeadScanner(HTMLParser):
+    "Collect og:url and canonical link, stopping at the end of <head>"
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.og_url: Optional[str] = None
+        self.canonical_url: Optional[str] = None
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        attributes = dict(attrs)
+        if tag == "meta" and attributes.get("property") == "og:url":
+            self.og_url = attributes.get("content")
+            raise _StopScan
+        if tag == "link" and "canonical" in (attributes.get("rel") or "").split():
+            self.canonical_url = self.canonical_url or attributes.get("href")
+        if tag == "body":
+            raise _StopScan
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "head":
+            raise _StopScan
+
+
+def scan_head(page_content: str, limit: int = HEAD_SCAN_LIMIT) -> Optional[str]:
+    scanner = HeadScanner()
+    try:
+        for start in range(0, min(len(page_content), limit), SCAN_CHUNK_SIZE):
+            end = start + SCAN_CHUNK_SIZE
+            scanner.feed(page_content[start:end])
+    except _StopScan:
+        pass
+    return scanner.og_url or scanner.canonical_url
+
+
+def match_fingerprint(page_content: str, limit: int = HEAD_SCAN_LIMIT) -> str:
+    head = page_content[:limit]
+    matches = {
+        portal: sum(head.count(marker) for marker in markers)
+        for portal, markers in PORTAL_FINGERPRINTS.items()
+    }
+    portal, count = max(matches.items(), key=lambda item: item[1])
+    return portal if count else ""
+
+
+def get_portal_from_url(url: str) -> str:
+    parsed_url = urllib.parse.urlparse(url)
+    return parsed_url.hostname or ""
+
+
+@timed()
+def identify_portal(page_content: PageSource) -> str:
+    if isinstance(page_content, Document):
+        page_content = page_content.text
+    url = scan_head(page_content)
+    if url:
+        return get_portal_from_url(url)
+    return match_fingerprint(page_content)
@@ -0,0 +1,276 @@
+import asyncio
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from types import TracebackType
+from typing import AsyncIterator, Callable, Deque, Dict, Iterable, Optional, Type
+
+from job_offer_parser.browser import BrowserPool
+from job_offer_parser.cache import get_page_cache
+from job_offer_parser.fetch import FetchStrategy, fetch_page, select_strategy
+from job_offer_parser.module_exceptions import DownloadError
+from job_offer_parser.parsers.document import Document
+from job_offer_parser.settings import (
+    CRAWL_BACKOFF,
+    CRAWL_BURST,
+    CRAWL_CONCURRENCY,
+    CRAWL_DEADLINE,
+    CRAWL_PORTAL_RATES,
+    CRAWL_QUEUE_SIZE,
+    CRAWL_RATE,
+    CRAWL_RETRIES,
+    CRAWL_TIMEOUT,
+)
+from job_offer_parser.utils import get_portal_from_url
+
+RETRY_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+class TokenBucket:
+    "Allow `rate` requests per second on average with bursts up to `capacity`"
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._tokens = min(self._capacity, self._tokens + elapsed * self._rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+                self._refill()
+            self._tokens -= 1
+
+    def try_acquire(self) -> float:
+        "Take a token if there is one; otherwise return the seconds until there is"
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self._rate
+
+
+class PortalQueue:
+    "URLs by portal, handed out from portals with a token so none holds up the rest"
+
+    def __init__(
+        self,
+        urls: Iterable[str],
+        get_bucket: Callable[[str], TokenBucket],
+        is_cached: Callable[[str], bool],
+    ) -> None:
+        self._get_bucket = get_bucket
+        self._cached: Deque[str] = deque()
+        self._urls: Dict[str, Deque[str]] = {}
+        for url in urls:
+            if is_cached(url):
+                self._cached.append(url)
+            else:
+                portal = get_portal_from_url(url)
+                self._urls.setdefault(portal, deque()).append(url)
+
+    async def get(self) -> Optional[str]:
+        "Next URL, whose portal token is already taken; None when all are handed out"
+        while not self._cached:
+            if not self._urls:
+                return None
+            delays = []
+            for portal, urls in list(self._urls.items()):
+                delay = self._get_bucket(portal).try_acquire()
+                if not delay:
+                    # Portals take turns: the one just served goes to the back
+                    del self._urls[portal]
+                    url = urls.popleft()
+                    if urls:
+                        self._urls[portal] = urls
+                    return url
+                delays.append(delay)
+            await asyncio.sleep(min(delays))
+        return self._cached.popleft()
+
+
+@dataclass
+class CrawlResult:
+    url: str
+    portal: str
+    page_content: Optional[str] = None
+    strategy: Optional[FetchStrategy] = None
+    attempts: int = 0
+    elapsed: float = 0.0
+    from_cache: bool = False
+    error: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return self.page_content is not None
+
+
+def is_retryable(error: Exception) -> bool:
+    if isinstance(error, DownloadError) and error.status:
+        return error.status in RETRY_STATUSES
+    return True
+
+
+class CrawlScheduler:
+    "Fetch many URLs concurrently, politely and with bounded latency"
+
+    def __init__(
+        self,
+        concurrency: int = CRAWL_CONCURRENCY,
+        rate: float = CRAWL_RATE,
+        burst: int = CRAWL_BURST,
+        portal_rates: Optional[Dict[str, float]] = None,
+        retries: int = CRAWL_RETRIES,
+        backoff: float = CRAWL_BACKOFF,
+        timeout: float = CRAWL_TIMEOUT,
+        deadline: float = CRAWL_DEADLINE,
+        queue_size: int = CRAWL_QUEUE_SIZE,
+    ) -> None:
+        self._concurrency = concurrency
+        self._rate = rate
+        self._burst = burst
+        self._portal_rates = {**CRAWL_PORTAL_RATES, **(portal_rates or {})}
+        self._retries = retries
+        self._backoff = backoff
+        self._timeout = timeout
+        self._deadline = deadline
+        self._queue_size = queue_size
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._browser_pool: Optional[BrowserPool] = None
+        self._browser_lock = asyncio.Lock()
+
+    async def __aenter__(self) -> "CrawlScheduler":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        if self._browser_pool is not None:
+            await self._browser_pool.__aexit__(exc_type, exc, traceback)
+            self._browser_pool = None
+
+    def _get_bucket(self, portal: str) -> TokenBucket:
+        bucket = self._buckets.get(portal)
+        if bucket is None:
+            rate = self._portal_rates.get(portal, self._rate)
+            bucket = self._buckets[portal] = TokenBucket(rate, self._burst)
+        return bucket
+
+    async def _get_browser_pool(self) -> BrowserPool:
+        async with self._browser_lock:
+            if self._browser_pool is None:
+                browser_pool = BrowserPool(size=self._concurrency)
+                self._browser_pool = await browser_pool.__aenter__()
+        return self._browser_pool
+
+    async def start_browser(self) -> None:
+        "Launch the browser now instead of on the first download that needs it"
+        await self._get_browser_pool()
+
+    async def _fetch_once(
+        self, url: str, strategy: FetchStrategy, timeout: float
+    ) -> str:
+        browser_pool = None
+        if strategy == FetchStrategy.BROWSER:
+            browser_pool = await self._get_browser_pool()
+        fetch_result = await asyncio.wait_for(
+            fetch_page(url, browser_pool, strategy), timeout
+        )
+        return fetch_result.page_content
+
+    async def _backoff_delay(self, attempt: int, deadline: float) -> bool:
+        "Sleep before the next attempt, unless that would pass the deadline"
+        delay = random.uniform(0, self._backoff * 2 ** (attempt - 1))
+        if time.monotonic() + delay >= deadline:
+            return False
+        await asyncio.sleep(delay)
+        return True
+
+    async def fetch(self, url: str, acquired: bool = False) -> CrawlResult:
+        "Fetch a URL; `acquired` when its portal token for the first attempt is taken"
+        result = CrawlResult(url, get_portal_from_url(url))
+        start = time.monotonic()
+        deadline = start + self._deadline
+        page_cache = get_page_cache()
+        result.page_content = page_cache.get_page(url) if page_cache else None
+        result.from_cache = result.page_content is not None
+        result.strategy = select_strategy(url)
+        while not result.ok and result.attempts <= self._retries:
+            timeout = min(self._timeout, deadline - time.monotonic())
+            if timeout <= 0:
+                break
+            if not acquired:
+                await self._get_bucket(result.portal).acquire()
+            acquired = False
+            result.attempts += 1
+            try:
+                async with self._semaphore:
+                    result.page_content = await self._fetch_once(
+                        url, result.strategy, timeout
+                    )
+            except Exception as e:
+                result.error = f"{e.__class__.__name__}: {e}"
+                if not is_retryable(e):
+                    break
+                if not await self._backoff_delay(result.attempts, deadline):
+                    break
+        if result.ok:
+            result.error = ""
+            if page_cache and not result.from_cache:
+                document = Document(result.page_content or "")
+                page_cache.put_page(url, document.content_hash, document.text)
+        result.elapsed = time.monotonic() - start
+        return result
+
+    async def _worker(
+        self,
+        urls: PortalQueue,
+        results: "asyncio.Queue[Optional[CrawlResult]]",
+    ) -> None:
+        while True:
+            url = await urls.get()
+            if url is None:
+                await results.put(None)
+                return
+            await results.put(await self.fetch(url, acquired=True))
+
+    async def crawl(self, urls: Iterable[str]) -> AsyncIterator[CrawlResult]:
+        "Yield results as they finish; workers pause while the consumer is busy"
+        page_cache = get_page_cache()
+        url_queue = PortalQueue(
+            urls,
+            self._get_bucket,
+            lambda url: page_cache is not None and page_cache.has_page(url),
+        )
+        results: "asyncio.Queue[Optional[CrawlResult]]" = asyncio.Queue(
+            self._queue_size
+        )
+        workers = [
+            asyncio.create_task(self._worker(url_queue, results))
+            for _ in range(self._concurrency)
+        ]
+        running = len(workers)
+        try:
+            while running:
+                result = await results.get()
+                if result is None:
+                    running -= 1
+                    continue
+                yield result
+        finally:
+            for worker in workers:
+                worker.cancel()
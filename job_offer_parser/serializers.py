@@ -0,0 +1,52 @@
+import json
+from typing import IO, Any, Iterable, Iterator
+
+from job_offer_parser.parsers.offer import JobOffer
+
+try:
+    import msgpack  # type: ignore
+except ImportError:
+    msgpack = None
+
+TEXT_FORMAT = "text"
+JSONL_FORMAT = "jsonl"
+PARQUET_FORMAT = "parquet"
+OUTPUT_FORMATS = (TEXT_FORMAT, JSONL_FORMAT)
+EXPORT_FORMATS = (JSONL_FORMAT, PARQUET_FORMAT)
+
+
+def to_json_line(offer: JobOffer) -> str:
+    return json.dumps(offer.to_dict(), ensure_ascii=False, separators=(",", ":"))
+
+
+def from_json_line(line: str) -> JobOffer:
+    return JobOffer.from_dict(json.loads(line))
+
+
+def write_jsonl(offers: Iterable[JobOffer], file: IO[str]) -> int:
+    count = 0
+    for offer in offers:
+        file.write(to_json_line(offer) + "\n")
+        count += 1
+    return count
+
+
+def read_jsonl(file: IO[str]) -> Iterator[JobOffer]:
+    for line in file:
+        if line.strip():
+            yield from_json_line(line)
+
+
+def _require_msgpack() -> Any:
+    if msgpack is None:
+        raise ImportError("msgpack is required for binary output: pip install msgpack")
+    return msgpack
+
+
+def to_msgpack(offer: JobOffer) -> bytes:
+    packed: bytes = _require_msgpack().packb(offer.to_dict(), use_bin_type=True)
+    return packed
+
+
+def from_msgpack(data: bytes) -> JobOffer:
+    return JobOffer.from_dict(_require_msgpack().unpackb(data, raw=False))
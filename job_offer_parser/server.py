@@ -0,0 +1,243 @@
+import asyncio
+import json
+import os
+import sys
+import time
+from concurrent.futures import Executor
+from dataclasses import asdict, dataclass
+from http import HTTPStatus
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from job_offer_parser.batch import create_executor
+from job_offer_parser.dedupe import close_dedupe_index
+from job_offer_parser.parser_stats import get_parser_stats
+from job_offer_parser.parsers.document import Document
+from job_offer_parser.pipeline import (
+    check_duplicate,
+    get_status_record,
+    parse_crawl_result,
+    record_parser_stats,
+)
+from job_offer_parser.scheduler import CrawlScheduler
+from job_offer_parser.settings import SERVE_HOST, SERVE_MAX_BODY_SIZE, SERVE_PORT
+from job_offer_parser.sources import STATUS_ERROR, ParsedPage, SourceStatus, save_page
+
+PARSE_PATH = "/parse"
+FETCH_PATH = "/fetch"
+HEALTH_PATH = "/health"
+JSON_CONTENT_TYPE = "application/json; charset=utf-8"
+TRUE_VALUES = ("1", "true", "yes")
+
+Response = Tuple[HTTPStatus, Dict[str, Any]]
+
+
+class HTTPError(Exception):
+    "Indicate that a request cannot be served"
+
+    def __init__(self, status: HTTPStatus, message: str = "") -> None:
+        super().__init__(message or status.phrase)
+        self.status = status
+
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    query: Dict[str, str]
+    headers: Dict[str, str]
+    body: bytes = b""
+
+    @property
+    def keep_alive(self) -> bool:
+        return self.headers.get("connection", "").lower() != "close"
+
+    @property
+    def text(self) -> str:
+        return self.body.decode("utf-8", errors="replace")
+
+    def flag(self, name: str) -> bool:
+        return self.query.get(name, "").lower() in TRUE_VALUES
+
+
+async def read_headers(reader: asyncio.StreamReader) -> Dict[str, str]:
+    headers: Dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if not line.strip():
+            return headers
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+
+def get_content_length(headers: Dict[str, str]) -> int:
+    # Bodies are read by Content-Length only; a chunked body would be taken as
+    # the next request on the connection
+    if "transfer-encoding" in headers:
+        raise HTTPError(HTTPStatus.NOT_IMPLEMENTED, "Transfer-Encoding not supported")
+    try:
+        length = int(headers.get("content-length") or 0)
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+    if length < 0:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+    return length
+
+
+async def read_request(
+    reader: asyncio.StreamReader, max_body_size: int = SERVE_MAX_BODY_SIZE
+) -> Optional[Request]:
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    try:
+        method, target, _ = request_line.decode("latin-1").split()
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+    headers = await read_headers(reader)
+    length = get_content_length(headers)
+    if length > max_body_size:
+        raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+    body = await reader.readexactly(length)
+    url = urlsplit(target)
+    query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+    return Request(method.upper(), url.path, query, headers, body)
+
+
+def encode_response(status: HTTPStatus, payload: Any, keep_alive: bool) -> bytes:
+    body = json.dumps(payload, ensure_ascii=False).encode()
+    head = (
+        f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+        f"Content-Type: {JSON_CONTENT_TYPE}\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+def get_worker_pid() -> int:
+    return os.getpid()
+
+
+class OfferServer:
+    "Answer parse and fetch requests with warm parsers, workers and browser"
+
+    def __init__(self, scheduler: CrawlScheduler, executor: Executor) -> None:
+        self._scheduler = scheduler
+        self._executor = executor
+        self._routes: Dict[
+            str, Tuple[str, Callable[[Request], Awaitable[Response]]]
+        ] = {
+            PARSE_PATH: ("POST", self.parse),
+            FETCH_PATH: ("POST", self.fetch),
+            HEALTH_PATH: ("GET", self.health),
+        }
+
+    async def warm_up(self, workers: int) -> None:
+        "Start every worker process, importing the parsers, before the first request"
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(
+                loop.run_in_executor(self._executor, get_worker_pid)
+                for _ in range(workers)
+            )
+        )
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except HTTPError as e:
+                    payload = {"error": str(e)}
+                    writer.write(encode_response(e.status, payload, False))
+                    break
+                if request is None:
+                    break
+                status, payload = await self.dispatch(request)
+                writer.write(encode_response(status, payload, request.keep_alive))
+                await writer.drain()
+                if not request.keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, request: Request) -> Response:
+        try:
+            route = self._routes.get(request.path)
+            if route is None:
+                raise HTTPError(HTTPStatus.NOT_FOUND)
+            method, handler = route
+            if request.method != method:
+                raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED)
+            return await handler(request)
+        except HTTPError as e:
+            return e.status, {"error": str(e)}
+        except Exception as e:
+            error = f"{e.__class__.__name__}: {e}"
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": error}
+
+    async def _parse_page(self, url: str, page_content: str) -> ParsedPage:
+        loop = asyncio.get_running_loop()
+        page = await loop.run_in_executor(
+            self._executor, parse_crawl_result, url, page_content
+        )
+        record_parser_stats(page)
+        return page
+
+    async def parse(self, request: Request) -> Response:
+        "Parse raw HTML from the body; `url` is optional and selects the portal"
+        start = time.monotonic()
+        page = await self._parse_page(request.query.get("url", ""), request.text)
+        record = asdict(page.status)
+        record["elapsed"] = round(time.monotonic() - start, 3)
+        return HTTPStatus.OK, record
+
+    async def fetch(self, request: Request) -> Response:
+        "Download, parse and, with `save=1`, save the offer at `url`"
+        url = request.query.get("url") or request.text.strip()
+        if not url:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Missing url")
+        result = await self._scheduler.fetch(url)
+        if result.page_content is None:
+            status = SourceStatus(url, STATUS_ERROR, result.portal, error=result.error)
+            return HTTPStatus.BAD_GATEWAY, get_status_record(status, result)
+        page = await self._parse_page(url, result.page_content)
+        skip = check_duplicate(page)
+        if request.flag("save") and page.filename and not skip:
+            page.status.saved_as = await asyncio.to_thread(
+                save_page, Document(result.page_content), url, page.filename
+            )
+        return HTTPStatus.OK, get_status_record(page.status, result)
+
+    async def health(self, request: Request) -> Response:
+        return HTTPStatus.OK, {"status": "ok"}
+
+
+async def serve(
+    host: str = SERVE_HOST,
+    port: int = SERVE_PORT,
+    workers: Optional[int] = None,
+    launch_browser: bool = False,
+    **scheduler_options: Any,
+) -> int:
+    workers = workers or os.cpu_count() or 1
+    with create_executor(workers, warm_up=True) as executor:
+        async with CrawlScheduler(**scheduler_options) as scheduler:
+            offer_server = OfferServer(scheduler, executor)
+            await offer_server.warm_up(workers)
+            if launch_browser:
+                await scheduler.start_browser()
+            server = await asyncio.start_server(offer_server.handle, host, port)
+            print(f"Serving on http://{host}:{port}", file=sys.stderr, flush=True)
+            try:
+                async with server:
+                    await server.serve_forever()
+            finally:
+                get_parser_stats().save()
+                close_dedupe_index()
+    return 0
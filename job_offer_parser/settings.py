@@ -1,3 +1,51 @@
+import os
+from typing import Dict, Optional
+
 RAW_OFFERS_DIR = "raw"
+RAW_ARCHIVE: Optional[str] = None
+ARCHIVE_DICT_SIZE = 112 * 1024
+ARCHIVE_DICT_SAMPLES = 200
 OFFERS_DIR = "offers"
 DEFAULT_RAW_OFFER_FILENAME = "test.html"
+HTML_BACKEND = "auto"
+PARSER_STATS_FILE: Optional[str] = None
+PARSER_STATS_DECAY = 0.9
+CACHE_ENABLED = True
+CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "jobparse",
+)
+CACHE_FILE = os.path.join(CACHE_DIR, "cache.sqlite3")
+CACHE_TTL = 24 * 60 * 60
+CACHE_MAX_SIZE = 512 * 1024 * 1024
+EXPORT_CHUNK_SIZE = 500
+MANIFEST_FILE = ".jobparse-manifest.sqlite3"
+MANIFEST_FLUSH_SIZE = 500
+BENCH_RESULTS_FILE = "bench-results.json"
+BENCH_REPEAT = 5
+BENCH_THRESHOLD = 0.2
+IMPORT_TIME_BUDGET = 0.05
+HTTP_TIMEOUT = 30.0
+BROWSER_TIMEOUT = 30.0
+CRAWL_CONCURRENCY = 8
+CRAWL_QUEUE_SIZE = 32
+CRAWL_RATE = 1.0
+CRAWL_BURST = 2
+CRAWL_PORTAL_RATES: Dict[str, float] = {}
+CRAWL_RETRIES = 3
+CRAWL_BACKOFF = 1.0
+CRAWL_TIMEOUT = 60.0
+CRAWL_DEADLINE = 180.0
+SERVE_HOST = "127.0.0.1"
+SERVE_PORT = 8765
+SERVE_MAX_BODY_SIZE = 16 * 1024 * 1024
+DEDUPE_MODE: Optional[str] = None
+DEDUPE_FILE = ".jobparse-dedupe.sqlite3"
+DEDUPE_NUM_PERM = 64
+DEDUPE_BANDS = 16
+DEDUPE_THRESHOLD = 0.8
+DEDUPE_SHINGLE_SIZE = 3
+HTTP_USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/110.0.0.0 Safari/537.36"
+)
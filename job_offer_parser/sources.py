@@ -0,0 +1,76 @@
+import sys
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from job_offer_parser.archive import get_unique_filename, save_raw_offer
+from job_offer_parser.module_exceptions import AttributeNotFoundError, NoParserFound
+from job_offer_parser.parsers.document import Document
+from job_offer_parser.utils import (
+    generate_fallback_filename,
+    generate_filename,
+    get_portal_from_url,
+    identify_portal,
+    parse_page,
+    sanitize_filename,
+)
+
+STDIN_SOURCE = "-"
+STATUS_PARSED = "parsed"
+STATUS_FAILED = "failed"
+STATUS_NO_PARSER = "no_parser"
+STATUS_ERROR = "error"
+
+
+@dataclass
+class SourceStatus:
+    source: str
+    status: str = STATUS_FAILED
+    portal: str = ""
+    parser: str = ""
+    saved_as: str = ""
+    error: str = ""
+    duplicate_of: str = ""
+    offer: Optional[Dict[str, Any]] = None
+
+
+def read_sources(sources: List[str]) -> List[str]:
+    if STDIN_SOURCE not in sources:
+        return sources
+    stdin_sources = [line.strip() for line in sys.stdin if line.strip()]
+    return [
+        expanded
+        for source in sources
+        for expanded in (stdin_sources if source == STDIN_SOURCE else [source])
+    ]
+
+
+def save_page(document: Document, url: str, proposition: str) -> str:
+    filename = get_unique_filename(sanitize_filename(proposition), document.text)
+    return save_raw_offer(document.text, filename, url)
+
+
+@dataclass
+class ParsedPage:
+    status: SourceStatus
+    filename: str = ""
+    failed_parsers: List[str] = field(default_factory=list)
+
+
+def parse_downloaded(url: str, page_content: str) -> ParsedPage:
+    "Parse a fetched page and propose the filename it should be saved under"
+    document = Document(page_content)
+    portal = get_portal_from_url(url) if url else identify_portal(document)
+    page = ParsedPage(SourceStatus(url, portal=portal))
+    status = page.status
+    try:
+        parser, offer = parse_page(document, status.portal, page.failed_parsers)
+    except (AttributeNotFoundError, NoParserFound) as e:
+        if isinstance(e, NoParserFound):
+            status.status = STATUS_NO_PARSER
+        status.error = str(e)
+        page.filename = generate_fallback_filename(url)
+        return page
+    page.filename = generate_filename(parser)
+    status.status, status.parser = STATUS_PARSED, parser.__class__.__name__
+    status.offer = offer.to_dict()
+    return page
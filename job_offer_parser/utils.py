@@ -1,33 +1,68 @@
+import hashlib
 import urllib.parse
 from datetime import date
-from typing import List, Type
+from typing import List, Optional, Tuple, Type
 
-from bs4 import BeautifulSoup
-from job_offer_parser.module_exceptions import NoParserFound
+from job_offer_parser.cache import get_page_cache
+from job_offer_parser.instrumentation import span
+from job_offer_parser.module_exceptions import AttributeNotFoundError, NoParserFound
+from job_offer_parser.parser_stats import get_parser_stats
 from job_offer_parser.parsers.base_parser import Parser, ParserGenerateFilename
-from pyppeteer import launch  # type: ignore
-
-
-def identify_portal(page_content: str) -> str:
-    soup = BeautifulSoup(page_content, features="html.parser")
-    url = soup.find("meta", property="og:url")["content"]  # type: ignore
-    portal = get_portal_from_url(url)  # type: ignore
-    return portal
+from job_offer_parser.parsers.document import PageSource, as_document
+from job_offer_parser.parsers.offer import JobOffer
+from job_offer_parser.parsers.registry import REGISTRY
+from job_offer_parser.portal import get_portal_from_url, identify_portal  # noqa F401
 
 
 def get_portal_parsers(portal: str) -> List[Type[Parser]]:
-    parser_candidates = []
-    for parser_cls in Parser.__subclasses__():
-        if parser_cls.meets_condition(portal):
-            parser_candidates.append(parser_cls)
+    parser_candidates = REGISTRY.get_parsers(portal)
     if not parser_candidates:
         raise NoParserFound(f"No parser found for {portal}!")
-    return parser_candidates
-
-
-def get_portal_from_url(url: str) -> str:
-    parsed_url = urllib.parse.urlparse(url)
-    return parsed_url.hostname or ""
+    return get_parser_stats().order(portal, parser_candidates)
+
+
+def parse_page(
+    page_content: PageSource,
+    portal: str,
+    failed_parsers: Optional[List[str]] = None,
+) -> Tuple[Parser, JobOffer]:
+    document = as_document(page_content)
+    parser_stats = get_parser_stats()
+    error = AttributeNotFoundError(f"No parser succeeded for {portal}!")
+    # Creating every candidate first lets the document build one tree for all
+    parsers = [parser_cls(document) for parser_cls in get_portal_parsers(portal)]
+    for parser in parsers:
+        parser_cls = parser.__class__
+        try:
+            offer = extract_with_cache(parser)
+        except AttributeNotFoundError as e:
+            parser_stats.record(portal, parser_cls.__name__, success=False)
+            if failed_parsers is not None:
+                failed_parsers.append(parser_cls.__name__)
+            error = e
+            continue
+        parser_stats.record(portal, parser_cls.__name__, success=True)
+        return parser, offer
+    raise error
+
+
+def extract_with_cache(parser: Parser) -> JobOffer:
+    page_cache = get_page_cache()
+    if page_cache is None:
+        with span("extract", parser.__class__.__name__):
+            return parser.extract()
+    content_hash = parser.document.content_hash
+    offer = page_cache.get_result(content_hash, parser.__class__)
+    if offer is not None:
+        return offer
+    try:
+        with span("extract", parser.__class__.__name__):
+            offer = parser.extract()
+    except AttributeNotFoundError as e:
+        page_cache.put_result(content_hash, parser.__class__, error=str(e))
+        raise
+    page_cache.put_result(content_hash, parser.__class__, offer)
+    return offer
 
 
 def generate_filename(parser: ParserGenerateFilename) -> str:
@@ -37,8 +72,19 @@ def generate_filename(parser: ParserGenerateFilename) -> str:
     return f"{today} {company_name} - {job_title}.html"
 
 
+def generate_fallback_filename(url: str) -> str:
+    today = date.today().strftime("%y%m%d")
+    hostname = urllib.parse.urlsplit(url).hostname or "unknown"
+    url_hash = hashlib.sha1(url.encode()).hexdigest()[:8]
+    return f"{today} {hostname} {url_hash}.html"
+
+
+def sanitize_filename(filename: str) -> str:
+    return filename.replace("/", "|")
+
+
 def ask_user_for_filename(proposition: str) -> str:
-    proposition = proposition.replace("/", "|")
+    proposition = sanitize_filename(proposition)
     user_filename = input(f'Provide a filename or confirm "{proposition}" [Enter]: ')
     filename = user_filename or proposition
     return filename
@@ -56,11 +102,7 @@ def save_to_file(text: str, filename: str) -> None:
 
 
 async def download_page(url: str) -> str:
-    browser = await launch()
-    page = await browser.newPage()
-
-    await page.goto(url)
-    page_content: str = await page.content()
-    await browser.close()
+    from job_offer_parser.browser import BrowserPool
 
-    return page_content
+    async with BrowserPool(size=1) as pool:
+        return await pool.download(url)
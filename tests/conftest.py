@@ -0,0 +1,15 @@
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+from job_offer_parser.cache import is_cache_enabled, set_cache_enabled
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+@pytest.fixture(autouse=True)
+def no_cache() -> Iterator[None]:
+    enabled = is_cache_enabled()
+    set_cache_enabled(False)
+    yield
+    set_cache_enabled(enabled)
@@ -0,0 +1,118 @@
+import os
+from pathlib import Path
+from typing import Dict
+
+import pytest
+from job_offer_parser.archive import (
+    INDEX_SUFFIX,
+    PACK_CAT,
+    RawArchive,
+    pack,
+    train_zlib_dictionary,
+)
+from job_offer_parser.module_exceptions import CorruptArchiveError
+
+PAGES = {
+    name: f"<html><body><div class='offer'>{name} {'lorem ipsum ' * 50}</div>"
+    f"</body></html>"
+    for name in ("a.html", "b.html", "c.html")
+}
+
+
+def create_pack(tmp_path: Path, pages: Dict[str, str] = PAGES) -> str:
+    path = str(tmp_path / "offers.pack")
+    samples = [text.encode() for text in pages.values()]
+    with RawArchive.create(path, samples) as archive:
+        for name, text in pages.items():
+            archive.add(text, name)
+    return path
+
+
+def truncate(path: str, length: int) -> None:
+    with open(path, "r+b") as file:
+        file.truncate(os.path.getsize(path) - length)
+
+
+def test_read_round_trip(tmp_path: Path) -> None:
+    with RawArchive(create_pack(tmp_path)) as archive:
+        assert {name: archive.get(name) for name in archive.names()} == PAGES
+
+
+def test_read_past_end_of_truncated_pack_raises(tmp_path: Path) -> None:
+    path = create_pack(tmp_path)
+    archive = RawArchive(path)
+    truncate(path, 20)
+
+    with pytest.raises(CorruptArchiveError):
+        archive.get("c.html")
+    archive.close()
+
+
+def test_reopening_truncated_pack_drops_damaged_record(tmp_path: Path) -> None:
+    path = create_pack(tmp_path)
+    truncate(path, 20)
+
+    with RawArchive(path) as archive:
+        assert archive.names() == ["a.html", "b.html"]
+        archive.add(PAGES["c.html"], "c.html")
+
+    with RawArchive(path) as archive:
+        assert {name: archive.get(name) for name in archive.names()} == PAGES
+
+
+def test_rebuild_index_stops_at_truncated_tail(tmp_path: Path) -> None:
+    path = create_pack(tmp_path)
+    truncate(path, 20)
+    os.remove(f"{path}{INDEX_SUFFIX}")
+
+    with RawArchive(path) as archive:
+        assert archive.names() == ["a.html", "b.html"]
+        assert archive.get("b.html") == PAGES["b.html"]
+
+
+def test_record_missing_from_index_is_recovered(tmp_path: Path) -> None:
+    path = create_pack(tmp_path)
+    index_path = f"{path}{INDEX_SUFFIX}"
+    with open(index_path) as file:
+        lines = file.readlines()
+    with open(index_path, "w") as file:
+        file.writelines(lines[:-1])
+
+    with RawArchive(path) as archive:
+        assert archive.get("c.html") == PAGES["c.html"]
+    with open(index_path) as file:
+        assert len(file.readlines()) == len(PAGES)
+
+
+def test_damaged_record_raises(tmp_path: Path) -> None:
+    path = create_pack(tmp_path)
+    with RawArchive(path) as archive:
+        entry = archive.entry("b.html")
+    with open(path, "r+b") as file:
+        file.seek(entry.offset + entry.length - 8)
+        file.write(b"\0" * 4)
+
+    with RawArchive(path) as archive:
+        with pytest.raises(CorruptArchiveError):
+            archive.get("b.html")
+
+
+def test_zlib_dictionary_holds_shared_markup() -> None:
+    samples = [text.encode() for text in PAGES.values()]
+
+    dictionary = train_zlib_dictionary(samples)
+
+    assert b"<div class='offer'>" in dictionary
+    assert b"a.html" not in dictionary
+
+
+def test_pack_cat_prints_record(tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    assert pack(PACK_CAT, create_pack(tmp_path), "b.html") == 0
+    assert capsys.readouterr().out == PAGES["b.html"]
+
+
+def test_pack_cat_unknown_name_fails(
+    tmp_path: Path, capsys: pytest.CaptureFixture
+) -> None:
+    assert pack(PACK_CAT, create_pack(tmp_path), "missing.html") == 1
+    assert "No record named 'missing.html'" in capsys.readouterr().err
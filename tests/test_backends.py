@@ -0,0 +1,61 @@
+from pathlib import Path
+
+import pytest
+from job_offer_parser.parsers import backends, base_parser
+from job_offer_parser.parsers.backends import HTML_PARSER, LXML
+from job_offer_parser.parsers.base_parser import Parser
+from job_offer_parser.parsers.document import Document
+from job_offer_parser.parsers.justjoinit import JustJoinITParser
+from job_offer_parser.parsers.offer import EXTRACTION_VERSION
+from job_offer_parser.portal import PORTAL_FINGERPRINTS
+from job_offer_parser.utils import identify_portal, parse_page
+from tests.conftest import FIXTURES_DIR
+
+PAGES = sorted(FIXTURES_DIR.glob("*.html"))
+
+
+def extract(page: Path, backend: str) -> dict:
+    document = Document(page.read_text(), backend)
+    parser, offer = parse_page(document, identify_portal(document))
+    return {"parser": parser.__class__.__name__, **offer.to_dict()}
+
+
+@pytest.mark.parametrize("page", PAGES, ids=lambda page: page.stem)
+def test_backends_extract_the_same_offer(page: Path, no_cache: None) -> None:
+    pytest.importorskip("lxml")
+
+    assert extract(page, LXML) == extract(page, HTML_PARSER)
+
+
+@pytest.mark.parametrize("page", PAGES, ids=lambda page: page.stem)
+def test_straining_keeps_the_offer(
+    page: Path, monkeypatch: pytest.MonkeyPatch, no_cache: None
+) -> None:
+    strained = extract(page, HTML_PARSER)
+    monkeypatch.setattr(Parser, "strain_document", False)
+
+    assert extract(page, HTML_PARSER) == strained
+
+
+def test_fixtures_cover_every_portal() -> None:
+    portals = {identify_portal(page.read_text()) for page in PAGES}
+
+    assert portals == set(PORTAL_FINGERPRINTS)
+
+
+def test_fingerprint_depends_on_backend(monkeypatch: pytest.MonkeyPatch) -> None:
+    pytest.importorskip("lxml")
+    monkeypatch.setattr(backends, "_backend", LXML)
+    lxml_fingerprint = JustJoinITParser.fingerprint()
+    monkeypatch.setattr(backends, "_backend", HTML_PARSER)
+
+    assert JustJoinITParser.fingerprint() != lxml_fingerprint
+
+
+def test_fingerprint_depends_on_extraction_version(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    fingerprint = JustJoinITParser.fingerprint()
+    monkeypatch.setattr(base_parser, "EXTRACTION_VERSION", EXTRACTION_VERSION + 1)
+
+    assert JustJoinITParser.fingerprint() != fingerprint
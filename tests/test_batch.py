@@ -0,0 +1,22 @@
+from typing import Iterator, List
+
+from job_offer_parser.batch import FUTURES_PER_WORKER, run_batch
+from tests.conftest import FIXTURES_DIR
+
+PAGES = sorted(str(page) for page in FIXTURES_DIR.glob("*.html"))
+
+
+def test_unordered_batch_bounds_files_in_flight(no_cache: None) -> None:
+    submitted: List[str] = []
+
+    def filenames() -> Iterator[str]:
+        for page in PAGES:
+            submitted.append(page)
+            yield page
+
+    results = run_batch(filenames(), workers=1)
+    first = next(results)
+
+    assert len(submitted) <= FUTURES_PER_WORKER + 1
+    remaining = [result.filename for result in results]
+    assert sorted([first.filename, *remaining]) == PAGES
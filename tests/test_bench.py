@@ -0,0 +1,57 @@
+import json
+from pathlib import Path
+from typing import Any, List
+
+import pytest
+from job_offer_parser.archive import import_directory
+from job_offer_parser.bench import BenchResult, bench, bench_file, measure_selectors
+from job_offer_parser.parsers.document import Document
+from job_offer_parser.parsers.nofluffjobs import NoFluffJobsParser
+from job_offer_parser.parsers.selector_index import SelectorIndex
+from tests.conftest import FIXTURES_DIR
+
+PAGES = sorted(str(page) for page in FIXTURES_DIR.glob("*.html"))
+
+
+def test_bench_fixtures_from_a_pack(
+    tmp_path: Path, capsys: pytest.CaptureFixture
+) -> None:
+    pack_path, output = str(tmp_path / "fixtures.pack"), tmp_path / "bench.json"
+    import_directory(PAGES, pack_path)
+
+    bench(pack_path, str(output), repeat=1)
+
+    results = json.loads(output.read_text())["results"]
+    assert {Path(result["filename"]).name for result in results} == {
+        Path(page).name for page in PAGES
+    }
+    assert sum(result["ok"] for result in results) == len(PAGES)
+    assert "will not show DOM-size costs" in capsys.readouterr().err
+
+
+def test_attribute_lookups_are_timed_on_a_fresh_index() -> None:
+    (result,) = bench_file(str(FIXTURES_DIR / "nofluffjobs.html"), repeat=1)
+
+    assert set(result.attributes) == {"company_name", "job_title"}
+    assert all(timing > 0 for timing in result.attributes.values())
+
+
+def test_attribute_lookups_exclude_the_index_build(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    builds: List[Any] = []
+    build = SelectorIndex._build
+
+    def counting_build(index: SelectorIndex) -> None:
+        builds.append(index)
+        build(index)
+
+    monkeypatch.setattr(SelectorIndex, "_build", counting_build)
+    document = Document((FIXTURES_DIR / "nofluffjobs.html").read_text())
+    result = BenchResult("nofluffjobs.html", "nofluffjobs.com", "NoFluffJobsParser")
+
+    measure_selectors(result, NoFluffJobsParser, document, repeat=3)
+
+    # Three timed builds for index_build, one shared by every attribute
+    assert len(builds) == 4
+    assert len(result.attributes) == 2
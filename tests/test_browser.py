@@ -0,0 +1,110 @@
+import asyncio
+import os
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Iterator, List
+
+import pytest
+from job_offer_parser.browser import BrowserPool, download_pages
+from tests.conftest import FIXTURES_DIR
+
+pyppeteer = pytest.importorskip("pyppeteer")
+
+
+class FakePage:
+    def __init__(self) -> None:
+        self.url = ""
+
+    async def setRequestInterception(self, enabled: bool) -> None:
+        pass
+
+    def on(self, event: str, handler: Any) -> None:
+        pass
+
+    async def goto(self, url: str, timeout: float) -> None:
+        if "missing" in url:
+            raise TimeoutError(f"Navigation to {url} timed out")
+        self.url = url
+
+    async def content(self) -> str:
+        return f"<html>{self.url}</html>"
+
+
+class FakeBrowser:
+    def __init__(self, pages_before_failure: int = -1) -> None:
+        self.pages_before_failure = pages_before_failure
+        self.closed = False
+
+    async def newPage(self) -> FakePage:
+        if self.pages_before_failure == 0:
+            raise ConnectionError("Browser closed unexpectedly")
+        self.pages_before_failure -= 1
+        return FakePage()
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+def use_fake_browser(monkeypatch: pytest.MonkeyPatch, browser: FakeBrowser) -> None:
+    async def launch(**options: Any) -> FakeBrowser:
+        return browser
+
+    monkeypatch.setattr(pyppeteer, "launch", launch)
+
+
+def test_failed_download_keeps_other_pages(monkeypatch: pytest.MonkeyPatch) -> None:
+    use_fake_browser(monkeypatch, FakeBrowser())
+    urls = ["https://a.example/1", "https://a.example/missing", "https://a.example/2"]
+
+    pages = asyncio.run(download_pages(urls, concurrency=2))
+
+    assert [page.ok for page in pages] == [True, False, True]
+    assert pages[0].page_content == "<html>https://a.example/1</html>"
+    assert pages[1].error.startswith("TimeoutError:")
+
+
+def test_browser_is_closed_when_opening_pages_fails(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    browser = FakeBrowser(pages_before_failure=1)
+    use_fake_browser(monkeypatch, browser)
+
+    async def open_pool() -> None:
+        async with BrowserPool(size=2):
+            pass
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(open_pool())
+    assert browser.closed
+
+
+@pytest.fixture
+def fixtures_server() -> Iterator[str]:
+    handler = partial(SimpleHTTPRequestHandler, directory=str(FIXTURES_DIR))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_download_pages_from_http_server(fixtures_server: str) -> None:
+    from pyppeteer.chromium_downloader import (  # type: ignore
+        chromium_executable,
+    )
+
+    if not os.path.exists(chromium_executable()):
+        pytest.skip("Chromium is not installed")
+    urls: List[str] = [
+        f"{fixtures_server}/nofluffjobs.html",
+        f"{fixtures_server}/missing.html",
+        "http://127.0.0.1:9/unreachable.html",
+    ]
+
+    pages = asyncio.run(download_pages(urls, concurrency=2))
+
+    assert "nofluffjobs.com" in (pages[0].page_content or "")
+    assert pages[1].ok
+    assert not pages[2].ok and pages[2].error
@@ -0,0 +1,48 @@
+from pathlib import Path
+
+from job_offer_parser.dedupe import DedupeIndex
+from job_offer_parser.parsers.offer import JobOffer
+
+DESCRIPTION = "We are looking for a Python developer to build data pipelines."
+
+
+def create_index(tmp_path: Path) -> DedupeIndex:
+    return DedupeIndex(str(tmp_path / "dedupe.sqlite3"))
+
+
+def test_offers_with_same_content_are_duplicates(tmp_path: Path) -> None:
+    index = create_index(tmp_path)
+    offer = JobOffer(company="Acme", title="Python Developer", description=DESCRIPTION)
+
+    assert index.check("first.html", offer) is None
+    duplicate = index.check("second.html", offer)
+
+    assert duplicate is not None
+    assert duplicate.source == "first.html"
+    index.close()
+
+
+def test_offers_with_only_a_title_are_not_duplicates(tmp_path: Path) -> None:
+    index = create_index(tmp_path)
+    offer = JobOffer(company="Acme", title="Python Developer")
+
+    assert index.check("first.html", offer) is None
+    assert index.check("second.html", offer) is None
+    index.close()
+
+
+def test_company_spellings_share_band_keys(tmp_path: Path) -> None:
+    index = create_index(tmp_path)
+    offer = JobOffer(
+        company="Acme Software Sp. z o.o.",
+        title="Python Developer",
+        description=DESCRIPTION,
+    )
+    index.check("first.html", offer)
+    offer.company = "ACME software"
+
+    duplicate = index.check("second.html", offer)
+
+    assert duplicate is not None
+    assert duplicate.source == "first.html"
+    index.close()
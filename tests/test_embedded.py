@@ -0,0 +1,109 @@
+import json
+
+import pytest
+from job_offer_parser.parsers import base_parser
+from job_offer_parser.parsers.embedded import find_object, job_posting_to_offer
+from job_offer_parser.parsers.justjoinit import JustJoinITParser
+
+DOM_PAGE = """<html><body>
+<div class="css-1id4k1">Python Developer</div>
+<div class="css-1kgdb8a"><a class="css-l4opor" href="https://acme.com">Acme</a></div>
+<div class="css-1f4p1d3"><span class="css-9wmrp4">Warsaw</span></div>
+<div class="css-p1hlmi">We are looking for a Python developer.</div>
+{script}
+</body></html>"""
+
+
+def make_page(data: dict, script_type: str = "application/ld+json") -> str:
+    script = f'<script type="{script_type}">{json.dumps(data)}</script>'
+    return DOM_PAGE.format(script=script)
+
+
+def make_posting(**fields: object) -> dict:
+    return {
+        "@type": "JobPosting",
+        "title": "Python Developer",
+        "hiringOrganization": {"name": "Acme"},
+        **fields,
+    }
+
+
+@pytest.mark.parametrize(
+    "fields",
+    [
+        {"jobLocation": {"address": "Warsaw"}},
+        {"jobLocation": ["Warsaw", None, {"address": None}]},
+        {"skills": None, "description": None},
+        {"skills": [None, 3, {"name": None}]},
+        {"employmentType": ["FULL_TIME", None, {"name": "B2B"}]},
+        {"baseSalary": ["10000", None], "hiringOrganization": "Acme"},
+        {"hiringOrganization": {"name": "Acme", "sameAs": ["https://acme.com"]}},
+    ],
+)
+def test_job_posting_to_offer_accepts_legal_shapes(fields: dict) -> None:
+    offer = job_posting_to_offer(make_posting(**fields))
+
+    assert offer is not None
+    assert (offer.company, offer.title) == ("Acme", "Python Developer")
+
+
+def test_job_posting_to_offer_reads_text_address() -> None:
+    posting = make_posting(
+        jobLocation={"address": "Warsaw"},
+        skills="Python, SQL",
+        employmentType=["FULL_TIME", 1],
+    )
+
+    offer = job_posting_to_offer(posting)
+
+    assert offer is not None
+    assert offer.locations == ["Warsaw"]
+    assert [skill.name for skill in offer.tech_stack] == ["Python", "SQL"]
+    assert offer.details == {"Employment Type": "FULL_TIME, 1"}
+
+
+def test_job_posting_without_company_is_ignored() -> None:
+    assert job_posting_to_offer(make_posting(hiringOrganization=[])) is None
+
+
+def test_next_data_with_unexpected_values() -> None:
+    data = {
+        "props": {
+            "offer": {
+                "title": "Python Developer",
+                "companyName": "Acme",
+                "requiredSkills": [None, {"name": None}, {"name": "Python"}],
+                "multilocation": [None, "Warsaw", {"city": "Cracow"}],
+                "employmentTypes": [None, {"from": 100, "to": None}],
+                "body": None,
+            }
+        }
+    }
+    page = make_page(data, "application/json").replace(
+        'type="application/json"', 'id="__NEXT_DATA__" type="application/json"'
+    )
+
+    offer = JustJoinITParser(page).extract()
+
+    assert [skill.name for skill in offer.tech_stack] == ["Python"]
+    assert offer.locations == ["Cracow"]
+    assert offer.description == ""
+
+
+def test_embedded_mapping_error_falls_back_to_dom(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def broken_mapping(posting: dict) -> None:
+        raise TypeError("unexpected value")
+
+    monkeypatch.setattr(base_parser, "job_posting_to_offer", broken_mapping)
+    parser = JustJoinITParser(make_page(make_posting()))
+
+    assert parser.embedded_offer is None
+    assert parser.extract(["company", "locations"]).locations == ["Warsaw"]
+
+
+def test_find_object_is_breadth_first() -> None:
+    data = {"a": {"b": {"c": {"title": "deep"}}}, "d": [{"title": "shallow"}]}
+
+    assert find_object(data, ("title",)) == {"title": "shallow"}
@@ -0,0 +1,138 @@
+import json
+import os
+from pathlib import Path
+from typing import List
+
+import pytest
+from job_offer_parser.export import CHECKPOINT_FILENAME, export
+from job_offer_parser.serializers import JSONL_FORMAT, PARQUET_FORMAT
+
+JUSTJOINIT_PAGE = """<html><head>
+<meta property="og:url" content="https://justjoin.it/offers/acme-python"></head>
+<body><div class="css-1id4k1">Python Developer</div>
+<div class="css-1kgdb8a"><a class="css-l4opor" href="https://acme.com">Acme</a></div>
+<div class="css-1f4p1d3"><span class="css-9wmrp4">Warsaw</span></div>
+<div class="css-1wla3xl">15 000 - 20 000 PLN</div>
+<div class="css-1ji7bvd">50-100</div><div class="css-1ji7bvd">Senior</div>
+<div class="css-1ikoimk"><div class="css-1q98d5e"><div class="css-1eroaug">Python</div>
+<div class="css-19mz16e">advanced</div></div></div>
+<div class="css-p1hlmi">We are looking for a Python developer.</div>
+</body></html>"""
+NOFLUFFJOBS_PAGE = """<html><head>
+<meta property="og:url" content="https://nofluffjobs.com/pl/job/go-dev"></head><body>
+<a class="inline-info d-flex align-items-center text-primary ng-star-inserted">Zeta</a>
+<div class="posting-details-description d-flex align-items-center align-items-lg-start flex-column justify-content-center justify-content-lg-start">
+Go Developer</div></body></html>"""  # noqa: E501
+
+
+def write_page(directory: Path, name: str, content: str) -> None:
+    (directory / name).write_text(content)
+
+
+def test_export_after_completed_run_includes_earlier_names(tmp_path: Path) -> None:
+    raw_dir, output_dir = tmp_path / "raw", tmp_path / "offers"
+    raw_dir.mkdir()
+    write_page(raw_dir, "230105 Zeta - Dev.html", NOFLUFFJOBS_PAGE)
+    export(str(raw_dir), str(output_dir), workers=1)
+
+    assert not (output_dir / CHECKPOINT_FILENAME).exists()
+
+    write_page(raw_dir, "230105 Alpha - Dev.html", JUSTJOINIT_PAGE)
+    export(str(raw_dir), str(output_dir), workers=1)
+
+    lines = [
+        line
+        for path in output_dir.rglob("*.jsonl")
+        for line in path.read_text().splitlines()
+    ]
+    assert any("Alpha - Dev" in line for line in lines)
+
+
+def read_sources(output_dir: Path) -> List[str]:
+    return sorted(
+        json.loads(line)["source"]
+        for path in output_dir.rglob("*.jsonl")
+        for line in path.read_text().splitlines()
+    )
+
+
+def test_repeated_full_export_writes_every_record_once(tmp_path: Path) -> None:
+    raw_dir, output_dir = tmp_path / "raw", tmp_path / "offers"
+    raw_dir.mkdir()
+    write_page(raw_dir, "230105 Beta - Dev.html", NOFLUFFJOBS_PAGE)
+    write_page(raw_dir, "230106 Gamma - Dev.html", NOFLUFFJOBS_PAGE)
+    export(str(raw_dir), str(output_dir), workers=1, chunk_size=1)
+    write_page(raw_dir, "230104 Alpha - Dev.html", JUSTJOINIT_PAGE)
+
+    export(str(raw_dir), str(output_dir), workers=1, chunk_size=1)
+
+    names = [os.path.basename(source) for source in read_sources(output_dir)]
+    assert names == [
+        "230104 Alpha - Dev.html",
+        "230105 Beta - Dev.html",
+        "230106 Gamma - Dev.html",
+    ]
+
+
+def read_titles(output_dir: Path, output_format: str) -> List[str]:
+    if output_format == PARQUET_FORMAT:
+        parquet = pytest.importorskip("pyarrow.parquet")
+        return sorted(
+            title
+            for path in output_dir.rglob("*.parquet")
+            for title in parquet.read_table(path).column("title").to_pylist()
+        )
+    return sorted(
+        json.loads(line)["title"]
+        for path in output_dir.rglob("*.jsonl")
+        for line in path.read_text().splitlines()
+    )
+
+
+@pytest.mark.parametrize("output_format", [JSONL_FORMAT, PARQUET_FORMAT])
+def test_incremental_export_replaces_records_of_changed_files(
+    tmp_path: Path, output_format: str
+) -> None:
+    if output_format == PARQUET_FORMAT:
+        pytest.importorskip("pyarrow")
+    raw_dir, output_dir = tmp_path / "raw", tmp_path / "offers"
+    raw_dir.mkdir()
+    write_page(raw_dir, "230105 Zeta - Dev.html", NOFLUFFJOBS_PAGE)
+    write_page(raw_dir, "230106 Acme - Dev.html", JUSTJOINIT_PAGE)
+    export(str(raw_dir), str(output_dir), output_format, workers=1, incremental=True)
+    page = raw_dir / "230106 Acme - Dev.html"
+    page.write_text(JUSTJOINIT_PAGE.replace("Python Developer", "Rust Developer"))
+    os.utime(page, ns=(0, 0))
+
+    export(str(raw_dir), str(output_dir), output_format, workers=1, incremental=True)
+
+    assert read_titles(output_dir, output_format) == ["Go Developer", "Rust Developer"]
+
+
+def test_incremental_export_keeps_numbering_chunks(tmp_path: Path) -> None:
+    raw_dir, output_dir = tmp_path / "raw", tmp_path / "offers"
+    raw_dir.mkdir()
+    write_page(raw_dir, "230105 Zeta - Dev.html", NOFLUFFJOBS_PAGE)
+    export(str(raw_dir), str(output_dir), workers=1, incremental=True)
+    write_page(raw_dir, "230105 Alpha - Dev.html", NOFLUFFJOBS_PAGE)
+    export(str(raw_dir), str(output_dir), workers=1, incremental=True)
+
+    parts = sorted(path.name for path in output_dir.rglob("part-*.jsonl"))
+    assert parts == ["part-000001.jsonl", "part-000002.jsonl"]
+
+
+def test_parquet_parts_form_one_dataset(tmp_path: Path) -> None:
+    dataset = pytest.importorskip("pyarrow.dataset")
+    raw_dir, output_dir = tmp_path / "raw", tmp_path / "offers"
+    raw_dir.mkdir()
+    write_page(raw_dir, "230105 Acme - Python Dev.html", JUSTJOINIT_PAGE)
+    write_page(raw_dir, "230106 Zeta - Go Dev.html", NOFLUFFJOBS_PAGE)
+
+    export(str(raw_dir), str(output_dir), PARQUET_FORMAT, workers=1, chunk_size=1)
+
+    # The dataset schema is read from the first file: the one with empty lists
+    files = sorted((str(path) for path in output_dir.rglob("*.parquet")), reverse=True)
+    assert "portal=nofluffjobs.com" in files[0]
+    table = dataset.dataset(files, format="parquet").to_table()
+    assert table.num_rows == 2
+    assert sorted(table.column("company").to_pylist()) == ["Acme", "Zeta"]
@@ -0,0 +1,67 @@
+import os
+import sqlite3
+from pathlib import Path
+from typing import Iterator, List
+
+import pytest
+from job_offer_parser import batch as batch_module
+from job_offer_parser.batch import BatchResult, batch, parse_file
+from job_offer_parser.manifest import Manifest
+from job_offer_parser.settings import MANIFEST_FILE
+from tests.conftest import FIXTURES_DIR
+
+PAGES = sorted(str(page) for page in FIXTURES_DIR.glob("*.html"))
+
+
+def count_rows(filename: str) -> int:
+    with sqlite3.connect(filename) as connection:
+        (count,) = connection.execute("SELECT COUNT(*) FROM files").fetchone()
+    return int(count)
+
+
+def test_manifest_flushes_every_flush_size_records(tmp_path: Path) -> None:
+    filename = str(tmp_path / "manifest.sqlite3")
+    manifest = Manifest(filename, flush_size=2)
+
+    for page in PAGES[:3]:
+        manifest.record(BatchResult(page, portal="justjoin.it"))
+
+    assert count_rows(filename) == 2
+    manifest.close()
+    assert count_rows(filename) == 3
+
+
+def test_interrupted_batch_keeps_recorded_progress(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, no_cache: None
+) -> None:
+    def interrupted_run_batch(
+        filenames: List[str], **options: object
+    ) -> Iterator[BatchResult]:
+        yield parse_file(filenames[0])
+        raise KeyboardInterrupt
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(batch_module, "run_batch", interrupted_run_batch)
+
+    with pytest.raises(KeyboardInterrupt):
+        batch(str(FIXTURES_DIR), incremental=True)
+
+    assert count_rows(str(tmp_path / MANIFEST_FILE)) == 1
+
+
+def test_touched_file_is_skipped_by_content_hash(tmp_path: Path) -> None:
+    page = tmp_path / "offer.html"
+    page.write_text((FIXTURES_DIR / "nofluffjobs.html").read_text())
+    manifest = Manifest(str(tmp_path / "manifest.sqlite3"))
+    manifest.record(parse_file(str(page)))
+    manifest.flush()
+    os.utime(page, ns=(0, 0))
+
+    assert manifest.select_changed([str(page)]) == []
+    row = manifest._connection.execute("SELECT mtime_ns FROM files").fetchone()
+    assert row == (0,)
+
+    page.write_text(page.read_text().replace("Gamma", "Delta"))
+    os.utime(page, ns=(1, 1))
+    assert manifest.select_changed([str(page)]) == [str(page)]
+    manifest.close()
@@ -0,0 +1,26 @@
+import pytest
+from job_offer_parser.parsers.offer import parse_salary
+
+
+@pytest.mark.parametrize(
+    "text, minimum, maximum, currency",
+    [
+        ("15 000 - 20 000 PLN net/month - B2B", 15000, 20000, "PLN"),
+        ("15 000\n20 000 PLN", 15000, 20000, "PLN"),
+        ("15 000 – 20 000 zł", 15000, 20000, "PLN"),
+        ("12 000,50 - 16 000,50 EUR", 12000.5, 16000.5, "EUR"),
+        ("15000-20000 USD", 15000, 20000, "USD"),
+        ("15k - 20.5k", 15000, 20500, ""),
+        ("1234 567", 1234, 567, ""),
+        ("8 000 PLN", 8000, 8000, "PLN"),
+        ("Undisclosed salary", None, None, ""),
+    ],
+)
+def test_parse_salary(text: str, minimum: float, maximum: float, currency: str) -> None:
+    salary = parse_salary(text)
+
+    assert (salary.minimum, salary.maximum, salary.currency) == (
+        minimum,
+        maximum,
+        currency,
+    )
@@ -0,0 +1,69 @@
+from pathlib import Path
+from typing import Any, List
+
+import pytest
+from job_offer_parser import __main__ as main_module
+from job_offer_parser.__main__ import parse_source
+from job_offer_parser.dedupe import DEDUPE_FLAG, DEDUPE_SKIP, set_dedupe_mode
+from job_offer_parser.parsers import document
+from job_offer_parser.sources import STATUS_PARSED
+from tests.conftest import FIXTURES_DIR
+
+JUSTJOINIT_V1_PAGE = """<html><head>
+<meta property="og:url" content="https://justjoin.it/offers/acme-python"></head>
+<body><div class="css-1id4k1">Python Developer</div>
+<div class="css-1kgdb8a"><a class="css-l4opor" href="https://acme.com">Acme</a></div>
+<div class="css-1f4p1d3"><span class="css-9wmrp4">Warsaw</span></div>
+<div class="css-1wla3xl">15 000 - 20 000 PLN</div>
+<div class="css-1ji7bvd">50-100</div><div class="css-1ji7bvd">Senior</div>
+<div class="css-1ikoimk"><div class="css-1q98d5e"><div class="css-1eroaug">Python</div>
+<div class="css-19mz16e">advanced</div></div></div>
+<div class="css-p1hlmi">We are looking for a Python developer.</div>
+</body></html>"""
+
+
+def test_parser_fallback_builds_the_tree_once(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, no_cache: None
+) -> None:
+    calls: List[Any] = []
+    build_soup = document.build_soup
+
+    def counting_build_soup(*args: Any) -> Any:
+        calls.append(args)
+        return build_soup(*args)
+
+    monkeypatch.setattr(document, "build_soup", counting_build_soup)
+    page = tmp_path / "230101 Acme - Python Developer.html"
+    page.write_text(JUSTJOINIT_V1_PAGE)
+
+    status = parse_source(str(page), interactive=False)
+
+    assert (status.status, status.parser) == (STATUS_PARSED, "JustJoinITParser")
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize("mode, saved", [(DEDUPE_FLAG, 2), (DEDUPE_SKIP, 1)])
+def test_parse_saves_duplicates_only_when_flagging(
+    mode: str, saved: int, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    page = (FIXTURES_DIR / "justjoinit.html").read_text()
+    pages = {
+        "https://justjoin.it/offers/acme-1": page,
+        "https://justjoin.it/offers/acme-2": page.replace("<strong>", "<b>").replace(
+            "</strong>", "</b>"
+        ),
+    }
+    monkeypatch.setattr(
+        main_module, "download_source", lambda url: document.Document(pages[url])
+    )
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "raw").mkdir()
+    set_dedupe_mode(mode)
+    try:
+        statuses = [parse_source(url, interactive=False) for url in pages]
+    finally:
+        set_dedupe_mode(None)
+
+    assert statuses[1].duplicate_of == "https://justjoin.it/offers/acme-1"
+    assert bool(statuses[1].saved_as) == (mode == DEDUPE_FLAG)
+    assert len(list((tmp_path / "raw").iterdir())) == saved
@@ -0,0 +1,29 @@
+import asyncio
+from typing import List
+
+import pytest
+from job_offer_parser.fetch import FetchStrategy
+from job_offer_parser.scheduler import CrawlScheduler
+
+SLOW_URLS = [f"https://slow.example/{number}" for number in range(3)]
+FAST_URLS = [f"https://fast.example/{number}" for number in range(5)]
+
+
+def test_throttled_portal_does_not_hold_up_others(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    async def fetch_once(url: str, strategy: FetchStrategy, timeout: float) -> str:
+        return "<html></html>"
+
+    async def crawl() -> List[str]:
+        scheduler = CrawlScheduler(
+            concurrency=2, rate=1000.0, burst=1, portal_rates={"slow.example": 4.0}
+        )
+        monkeypatch.setattr(scheduler, "_fetch_once", fetch_once)
+        return [result.url async for result in scheduler.crawl(SLOW_URLS + FAST_URLS)]
+
+    urls = asyncio.run(crawl())
+
+    assert sorted(urls) == sorted(SLOW_URLS + FAST_URLS)
+    # Only the first slow URL has a token before every fast URL is done
+    assert urls.index(SLOW_URLS[1]) > max(urls.index(url) for url in FAST_URLS)
@@ -0,0 +1,157 @@
+import asyncio
+import json
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Any, Dict, Optional, Tuple
+
+import pytest
+from job_offer_parser.parsers.registry import PARSER_MODULES
+from job_offer_parser.scheduler import CrawlResult
+from job_offer_parser.server import (
+    FETCH_PATH,
+    PARSE_PATH,
+    HTTPError,
+    OfferServer,
+    Request,
+    read_request,
+)
+from job_offer_parser.settings import SERVE_MAX_BODY_SIZE
+from tests.conftest import FIXTURES_DIR
+
+OFFER_URL = "https://justjoin.it/offers/acme-senior-python-developer"
+OFFER_PAGE = (FIXTURES_DIR / "justjoinit.html").read_text()
+
+
+class FakeScheduler:
+    async def fetch(self, url: str) -> CrawlResult:
+        if url == OFFER_URL:
+            return CrawlResult(url, "justjoin.it", OFFER_PAGE, attempts=1)
+        return CrawlResult(url, "justjoin.it", attempts=3, error="TimeoutError: ")
+
+
+def exchange(data: bytes) -> Tuple[int, Dict[str, Any]]:
+    "Send one raw request to a fresh server and return the status and payload"
+
+    async def send() -> bytes:
+        with ThreadPoolExecutor(1) as executor:
+            scheduler: Any = FakeScheduler()
+            offer_server = OfferServer(scheduler, executor)
+            server = await asyncio.start_server(offer_server.handle, "127.0.0.1", 0)
+            async with server:
+                port = server.sockets[0].getsockname()[1]
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                writer.write(data)
+                await writer.drain()
+                response = await reader.read()
+                writer.close()
+        return response
+
+    head, _, body = asyncio.run(send()).partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(body)
+
+
+def post(path: str, body: bytes = b"") -> bytes:
+    return (
+        f"POST {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\n"
+        "Connection: close\r\n\r\n"
+    ).encode() + body
+
+
+def read(data: bytes) -> Optional[Request]:
+    async def feed_and_read() -> Optional[Request]:
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        return await read_request(reader)
+
+    return asyncio.run(feed_and_read())
+
+
+def test_read_request_with_body() -> None:
+    request = read(b"POST /parse?portal=x HTTP/1.1\r\nContent-Length: 4\r\n\r\nbody")
+
+    assert request is not None
+    assert (request.method, request.path, request.body) == ("POST", "/parse", b"body")
+    assert request.query == {"portal": "x"}
+
+
+@pytest.mark.parametrize(
+    "headers, status",
+    [
+        (b"Content-Length: -1\r\n", HTTPStatus.BAD_REQUEST),
+        (b"Content-Length: ten\r\n", HTTPStatus.BAD_REQUEST),
+        (b"Transfer-Encoding: chunked\r\n", HTTPStatus.NOT_IMPLEMENTED),
+    ],
+)
+def test_read_request_rejects_unusable_body_framing(
+    headers: bytes, status: HTTPStatus
+) -> None:
+    with pytest.raises(HTTPError) as error:
+        read(b"POST /parse HTTP/1.1\r\n" + headers + b"\r\n4\r\nbody\r\n0\r\n\r\n")
+
+    assert error.value.status == status
+
+
+@pytest.mark.parametrize(
+    "headers, status",
+    [
+        (
+            f"Content-Length: {SERVE_MAX_BODY_SIZE + 1}",
+            HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+        ),
+        ("Content-Length: -1", HTTPStatus.BAD_REQUEST),
+        ("Transfer-Encoding: chunked", HTTPStatus.NOT_IMPLEMENTED),
+    ],
+)
+def test_server_answers_unusable_body_framing(headers: str, status: HTTPStatus) -> None:
+    request = f"POST {PARSE_PATH} HTTP/1.1\r\n{headers}\r\n\r\n4\r\nbody\r\n"
+
+    code, payload = exchange(request.encode())
+
+    assert code == status
+    assert payload["error"]
+
+
+def test_parse_endpoint_parses_body() -> None:
+    code, payload = exchange(post(f"{PARSE_PATH}?url={OFFER_URL}", OFFER_PAGE.encode()))
+
+    assert code == HTTPStatus.OK
+    assert (payload["status"], payload["parser"]) == ("parsed", "JustJoinITParser")
+    assert payload["offer"]["company"] == "Acme & Sons"
+
+
+def test_fetch_endpoint_downloads_and_parses() -> None:
+    code, payload = exchange(post(f"{FETCH_PATH}?url={OFFER_URL}"))
+
+    assert code == HTTPStatus.OK
+    assert payload["offer"]["company"] == "Acme & Sons"
+    assert payload["attempts"] == 1
+
+
+def test_fetch_endpoint_reports_download_errors() -> None:
+    code, payload = exchange(post(FETCH_PATH, b"https://justjoin.it/offers/missing"))
+
+    assert code == HTTPStatus.BAD_GATEWAY
+    assert (payload["status"], payload["attempts"]) == ("error", 3)
+
+
+def test_fetch_endpoint_requires_url() -> None:
+    code, payload = exchange(post(FETCH_PATH))
+
+    assert (code, payload) == (HTTPStatus.BAD_REQUEST, {"error": "Missing url"})
+
+
+def test_warm_up_imports_parsers_and_tree_builder() -> None:
+    modules = [module for group in PARSER_MODULES.values() for module in group]
+    script = (
+        "import sys; from job_offer_parser.batch import warm_up_worker; "
+        f"warm_up_worker(); print(all(m in sys.modules for m in {modules + ['bs4']}))"
+    )
+
+    output = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    ).stdout
+
+    assert output.strip() == "True"
@@ -0,0 +1,40 @@
+from job_offer_parser.bench import (
+    LAZY_MODULES,
+    STARTUP_MODULE,
+    check_startup,
+    measure_import_time,
+)
+from job_offer_parser.parsers.registry import PARSER_MODULES
+from job_offer_parser.settings import IMPORT_TIME_BUDGET
+
+# Import time is noisy; the fastest of a few fresh interpreters is compared
+MEASUREMENTS = 3
+
+
+def test_startup_does_not_import_heavy_modules() -> None:
+    _, imported = measure_import_time()
+
+    assert imported.isdisjoint(LAZY_MODULES)
+
+
+def test_startup_does_not_import_portal_parsers() -> None:
+    _, imported = measure_import_time()
+    parser_modules = {
+        module for modules in PARSER_MODULES.values() for module in modules
+    }
+
+    assert imported.isdisjoint(parser_modules)
+
+
+def test_startup_import_time_within_budget() -> None:
+    measurements = [measure_import_time() for _ in range(MEASUREMENTS)]
+    import_time, imported = min(measurements, key=lambda measurement: measurement[0])
+
+    assert check_startup(import_time, imported, IMPORT_TIME_BUDGET) == []
+
+
+def test_package_import_is_lazy() -> None:
+    _, imported = measure_import_time("job_offer_parser")
+
+    assert imported.isdisjoint(LAZY_MODULES)
+    assert STARTUP_MODULE not in imported